@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Indexing benchmark for SpotlightX.
+
+Builds a temporary directory tree and .desktop files, then measures
+Indexer.index_applications and Indexer.index_files throughput, filesystem
+calls per file, cache save/load time and memory per phase.
+
+    python benchmarks/bench_indexing.py --files 100000 --depth 4 --output index.json
+    python benchmarks/bench_indexing.py --files 20000 --profile index.pstats
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import builtins
+import argparse
+import threading
+import platform
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import make_tree, write_desktop_files
+from bench_search import current_rss_mb, git_revision, peak_rss_mb
+
+from spotlightx.indexer import Indexer
+
+# Filesystem calls counted by the instrumented pass. DirEntry.stat() is
+# counted through CountingScandir; is_dir()/is_symlink() are answered from
+# the directory entry type on common filesystems and are not counted.
+COUNTED_CALLS = [
+    (os, 'listdir'), (os, 'stat'), (os, 'lstat'), (os, 'walk'), (builtins, 'open')
+]
+
+
+class CountingEntry:
+    """os.DirEntry proxy that counts stat() calls."""
+    
+    def __init__(self, entry, counts: Dict[str, int]):
+        self._entry = entry
+        self._counts = counts
+    
+    def stat(self, *args, **kwargs):
+        self._counts['DirEntry.stat'] += 1
+        return self._entry.stat(*args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._entry, name)
+
+
+class CountingScandir:
+    """os.scandir replacement yielding CountingEntry objects."""
+    
+    def __init__(self, scandir, path, counts: Dict[str, int]):
+        counts['os.scandir'] += 1
+        self._iterator = scandir(path)
+        self._counts = counts
+    
+    def __iter__(self):
+        for entry in self._iterator:
+            yield CountingEntry(entry, self._counts)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self._iterator.close()
+
+
+@contextmanager
+def count_calls(counts: Dict[str, int]):
+    """Count calls to the filesystem functions in COUNTED_CALLS."""
+    originals = []
+    for module, name in COUNTED_CALLS:
+        original = getattr(module, name)
+        originals.append((module, name, original))
+        key = f"{module.__name__}.{name}"
+        counts.setdefault(key, 0)
+        
+        def wrapper(*args, _original=original, _key=key, **kwargs):
+            counts[_key] += 1
+            return _original(*args, **kwargs)
+        
+        setattr(module, name, wrapper)
+    
+    scandir = os.scandir
+    counts.setdefault('os.scandir', 0)
+    counts.setdefault('DirEntry.stat', 0)
+    os.scandir = lambda path='.': CountingScandir(scandir, path, counts)
+    try:
+        yield counts
+    finally:
+        os.scandir = scandir
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+
+@contextmanager
+def phase(result: Dict[str, Any], name: str):
+    """Record wall time and RSS growth of a phase."""
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result[name] = {
+            'seconds': time.perf_counter() - start,
+            'rss_delta_mb': current_rss_mb() - rss_before
+        }
+
+
+@contextmanager
+def traced(result: Dict[str, Any], name: str):
+    """Record the peak of Python allocations made during a phase."""
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result.setdefault(name, {})['alloc_peak_mb'] = peak / (1024.0 * 1024.0)
+
+
+def profile_scans(indexer: Indexer, profiles: list):
+    """
+    cProfile only sees the thread it was enabled on; give every walker
+    thread its own profiler around scan_directory.
+    """
+    import cProfile
+    
+    original = indexer.scan_directory
+    local = threading.local()
+    
+    def scan_directory(*args, **kwargs):
+        profiler = getattr(local, 'profiler', None)
+        if profiler is None:
+            profiler = local.profiler = cProfile.Profile()
+            profiles.append(profiler)
+        return profiler.runcall(original, *args, **kwargs)
+    
+    indexer.scan_directory = scan_directory
+
+
+def make_indexer(cache_dir: str, desktop_dir: str, tree_root: str, depth: int) -> Indexer:
+    indexer = Indexer(cache_dir=cache_dir)
+    indexer.desktop_paths = [desktop_dir]
+    indexer.file_roots = [tree_root]
+    indexer.max_depth = depth + 1
+    indexer.max_files = sys.maxsize
+    return indexer
+
+
+def install(indexer: Indexer, apps: list, files):
+    """Swap indexed data into the indexer the way index_all does."""
+    with indexer.lock:
+        indexer.apps_data = apps
+        indexer.files_data = files
+        indexer.apps_index = indexer.build_name_index(app.get('name', '') for app in apps)
+        indexer.files_index = indexer.build_name_index(files.names)
+        indexer._app_positions = None
+        indexer.generation += 1
+
+
+def run(args) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix='spotlightx-bench-', dir=args.tmpdir)
+    try:
+        report = {
+            'benchmark': 'indexing',
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'settings': {
+                'files': args.files,
+                'apps': args.apps,
+                'depth': args.depth,
+                'fanout': args.fanout,
+                'seed': args.seed
+            }
+        }
+        
+        desktop_dir = os.path.join(workdir, 'applications')
+        tree_root = os.path.join(workdir, 'home')
+        cache_dir = os.path.join(workdir, 'cache')
+        
+        start = time.perf_counter()
+        write_desktop_files(desktop_dir, args.apps, args.seed)
+        report['tree'] = make_tree(tree_root, args.files, args.depth, args.fanout, args.seed)
+        report['tree']['build_seconds'] = time.perf_counter() - start
+        
+        indexer = make_indexer(cache_dir, desktop_dir, tree_root, args.depth)
+        
+        profiler = None
+        worker_profiles = []
+        if args.profile:
+            import cProfile
+            profile_scans(indexer, worker_profiles)
+            profiler = cProfile.Profile()
+            profiler.enable()
+        
+        with phase(report, 'index_applications'):
+            apps = indexer.index_applications()
+        with phase(report, 'index_files'):
+            files = indexer.index_files()
+        
+        if profiler is not None:
+            profiler.disable()
+        
+        report['index_applications']['items'] = len(apps)
+        report['index_applications']['items_per_second'] = len(apps) / report['index_applications']['seconds']
+        report['index_files']['items'] = len(files)
+        report['index_files']['items_per_second'] = len(files) / report['index_files']['seconds']
+        
+        install(indexer, apps, files)
+        
+        with phase(report, 'save_caches'):
+            indexer.save_caches()
+        indexer.close()
+        del indexer, apps, files
+        
+        with phase(report, 'load_caches'):
+            indexer = make_indexer(cache_dir, desktop_dir, tree_root, args.depth)
+        report['load_caches']['items'] = len(indexer.get_files())
+        indexer.close()
+        
+        # Separate pass so the wrappers and tracemalloc do not skew the
+        # timings above
+        counts = {}
+        indexer = make_indexer(os.path.join(workdir, 'cache-count'), desktop_dir, tree_root, args.depth)
+        with count_calls(counts):
+            with traced(report, 'index_applications'):
+                apps = indexer.index_applications()
+            with traced(report, 'index_files'):
+                files = indexer.index_files()
+        install(indexer, apps, files)
+        with traced(report, 'save_caches'):
+            indexer.save_caches()
+        indexer.close()
+        with traced(report, 'load_caches'):
+            make_indexer(os.path.join(workdir, 'cache-count'), desktop_dir, tree_root, args.depth).close()
+        total_items = max(len(apps) + len(files), 1)
+        report['fs_calls'] = {
+            'counts': counts,
+            'total': sum(counts.values()),
+            'per_item': sum(counts.values()) / total_items
+        }
+        
+        report['peak_rss_mb'] = peak_rss_mb()
+        
+        if profiler is not None:
+            import pstats
+            stats = pstats.Stats(profiler, stream=sys.stderr)
+            for worker_profile in worker_profiles:
+                stats.add(worker_profile)
+            stats.dump_stats(args.profile)
+            stats.sort_stats('cumulative').print_stats(args.profile_lines)
+            report['profile'] = args.profile
+        
+        return report
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_report(report: Dict[str, Any]):
+    for name in ('index_applications', 'index_files', 'save_caches', 'load_caches'):
+        entry = report[name]
+        rate = f"{entry['items_per_second']:10.0f} items/s" if 'items_per_second' in entry else ' ' * 18
+        print(
+            f"{name:<20} {entry['seconds']:8.3f}s {rate}  "
+            f"alloc peak {entry.get('alloc_peak_mb', 0):7.1f} MB  rss +{entry['rss_delta_mb']:6.1f} MB",
+            file=sys.stderr
+        )
+    print(f"fs calls per item   {report['fs_calls']['per_item']:8.2f}  {report['fs_calls']['counts']}", file=sys.stderr)
+    print(f"peak rss            {report['peak_rss_mb']:8.1f} MB", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SpotlightX indexing benchmark')
+    parser.add_argument('--files', type=int, default=20000, help='files in the generated tree')
+    parser.add_argument('--apps', type=int, default=300, help='number of .desktop files')
+    parser.add_argument('--depth', type=int, default=4, help='directory levels in the tree')
+    parser.add_argument('--fanout', type=int, default=6, help='subdirectories per directory')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tmpdir', help='where to build the tree (default: system temp dir)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='write cProfile stats of the indexing phases (timings then include profiler overhead)')
+    parser.add_argument('--profile-lines', type=int, default=25)
+    parser.add_argument('--output', help='write the JSON report here')
+    args = parser.parse_args()
+    
+    report = run(args)
+    print_report(report)
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Search latency benchmark for SpotlightX.
+
+Builds synthetic app and file corpora of increasing size, replays typing
+sequences through SearchEngine.search and SpotlightX.handle_query and
+reports latency percentiles, peak RSS and cache load time as JSON.
+
+    python benchmarks/bench_search.py --sizes 1000,10000,100000 --output bench.json
+    python benchmarks/bench_search.py --compare before.json after.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import resource
+import subprocess
+import tempfile
+from typing import List, Dict, Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import keystroke_sequences, make_file_records, write_desktop_files
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latencies, in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))] * 1000
+    
+    return {
+        'count': len(ordered),
+        'p50_ms': pick(50),
+        'p95_ms': pick(95),
+        'p99_ms': pick(99),
+        'mean_ms': sum(ordered) / len(ordered) * 1000,
+        'max_ms': ordered[-1] * 1000
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def current_rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024.0 * 1024.0)
+    except Exception:
+        return 0.0
+
+
+def replay(run_query, sequences: List[List[str]]) -> List[float]:
+    """Time every query of every typing sequence."""
+    samples = []
+    for queries in sequences:
+        for query in queries:
+            start = time.perf_counter()
+            run_query(query)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_size(size: int, sequences_per_size: int, app_count: int, seed: int,
+               with_plugins: bool) -> Dict[str, Any]:
+    """Run the whole benchmark for one corpus size in this process."""
+    from spotlightx.file_table import FileTable
+    from spotlightx.indexer import Indexer
+    from spotlightx.main import SpotlightX
+    from spotlightx.plugin_manager import PluginManager
+    from spotlightx.search import SearchEngine
+    
+    workdir = tempfile.mkdtemp(prefix='spotlightx-bench-')
+    try:
+        result = {'size': size}
+        
+        desktop_dir = os.path.join(workdir, 'applications')
+        app_names = write_desktop_files(desktop_dir, min(app_count, size), seed)
+        records = make_file_records(size, seed)
+        
+        cache_dir = os.path.join(workdir, 'cache')
+        indexer = Indexer(cache_dir=cache_dir)
+        indexer.desktop_paths = [desktop_dir]
+        
+        start = time.perf_counter()
+        apps = indexer.index_applications()
+        files = FileTable.from_records(records)
+        with indexer.lock:
+            indexer.apps_data = apps
+            indexer.files_data = files
+            indexer.apps_index = indexer.build_name_index(app.get('name', '') for app in apps)
+            indexer.files_index = indexer.build_name_index(files.names)
+            indexer._app_positions = None
+            indexer.generation += 1
+        result['build_s'] = time.perf_counter() - start
+        result['apps'] = len(apps)
+        result['files'] = len(files)
+        del records
+        
+        start = time.perf_counter()
+        indexer.save_caches()
+        result['save_s'] = time.perf_counter() - start
+        indexer.close()
+        del indexer, apps, files
+        
+        rss_before_load = current_rss_mb()
+        start = time.perf_counter()
+        indexer = Indexer(cache_dir=cache_dir)
+        result['load_s'] = time.perf_counter() - start
+        result['loaded_rss_mb'] = current_rss_mb() - rss_before_load
+        
+        targets = app_names + indexer.files_data.names[:5000]
+        sequences = keystroke_sequences(targets, sequences_per_size, seed)
+        
+        engine = SearchEngine(indexer)
+        result['search'] = percentiles(replay(engine.search, sequences))
+        
+        # handle_query without the Tk window: search plus plugin hooks
+        app = SpotlightX.__new__(SpotlightX)
+        app.indexer = indexer
+        app.search_engine = SearchEngine(indexer)
+        app.plugin_manager = PluginManager(config_dir=os.path.join(workdir, 'config'))
+        if with_plugins:
+            examples = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'spotlightx', 'plugins', 'examples')
+            install_example_plugins(examples, str(app.plugin_manager.plugins_dir))
+            app.plugin_manager.load_all_plugins()
+        result['handle_query'] = percentiles(replay(app.handle_query, sequences))
+        result['plugins'] = len(app.plugin_manager.plugins)
+        app.plugin_manager.shutdown()
+        
+        indexer.close()
+        result['peak_rss_mb'] = peak_rss_mb()
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def install_example_plugins(examples_dir: str, plugins_dir: str):
+    """Copy the bundled example plugins with enabled set to true."""
+    for name in sorted(os.listdir(examples_dir)):
+        source = os.path.join(examples_dir, name)
+        if not os.path.isfile(os.path.join(source, 'plugin.json')):
+            continue
+        target = os.path.join(plugins_dir, name)
+        shutil.copytree(source, target, dirs_exist_ok=True)
+        with open(os.path.join(target, 'plugin.json')) as f:
+            metadata = json.load(f)
+        metadata['enabled'] = True
+        with open(os.path.join(target, 'plugin.json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ''
+
+
+def run(args) -> Dict[str, Any]:
+    """Run every size in a fresh interpreter so peak RSS is per size."""
+    report = {
+        'benchmark': 'search',
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'settings': {
+            'sequences': args.sequences,
+            'apps': args.apps,
+            'seed': args.seed,
+            'plugins': args.plugins
+        },
+        'results': []
+    }
+    
+    for size in args.sizes:
+        command = [
+            sys.executable, os.path.abspath(__file__), '--single', str(size),
+            '--sequences', str(args.sequences), '--apps', str(args.apps), '--seed', str(args.seed)
+        ]
+        if args.plugins:
+            command.append('--plugins')
+        
+        print(f"Benchmarking {size} files...", file=sys.stderr)
+        output = subprocess.run(command, capture_output=True, text=True)
+        if output.returncode != 0:
+            print(output.stderr, file=sys.stderr)
+            continue
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        report['results'].append(result)
+        print_result(result)
+    
+    return report
+
+
+def print_result(result: Dict[str, Any]):
+    search = result.get('search', {})
+    handle = result.get('handle_query', {})
+    print(
+        f"{result['size']:>9} files  "
+        f"search p50 {search.get('p50_ms', 0):7.2f} p95 {search.get('p95_ms', 0):7.2f} "
+        f"p99 {search.get('p99_ms', 0):7.2f} ms  "
+        f"handle_query p95 {handle.get('p95_ms', 0):7.2f} ms  "
+        f"load {result['load_s']:.2f}s  peak {result['peak_rss_mb']:.0f} MB",
+        file=sys.stderr
+    )
+
+
+def compare(before_file: str, after_file: str):
+    """Print the relative change of every metric between two reports."""
+    with open(before_file) as f:
+        before = {r['size']: r for r in json.load(f)['results']}
+    with open(after_file) as f:
+        after = {r['size']: r for r in json.load(f)['results']}
+    
+    metrics = [
+        ('search', 'p50_ms'), ('search', 'p95_ms'), ('search', 'p99_ms'),
+        ('handle_query', 'p95_ms'), (None, 'load_s'), (None, 'peak_rss_mb')
+    ]
+    for size in sorted(set(before) & set(after)):
+        print(f"{size} files")
+        for section, key in metrics:
+            old = before[size].get(section, {}).get(key) if section else before[size].get(key)
+            new = after[size].get(section, {}).get(key) if section else after[size].get(key)
+            if not old or new is None:
+                continue
+            label = f"{section}.{key}" if section else key
+            print(f"  {label:<22} {old:10.3f} -> {new:10.3f}  ({(new - old) / old * 100:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SpotlightX search latency benchmark')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        type=lambda value: [int(s) for s in value.split(',') if s])
+    parser.add_argument('--sequences', type=int, default=200, help='typing sequences per size')
+    parser.add_argument('--apps', type=int, default=300, help='number of .desktop files')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--plugins', action='store_true', help='load the example plugins')
+    parser.add_argument('--output', help='write the JSON report here')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare(*args.compare)
+        return
+    
+    if args.single is not None:
+        result = bench_size(args.single, args.sequences, args.apps, args.seed, args.plugins)
+        print(json.dumps(result))
+        return
+    
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Synthetic corpora for the SpotlightX benchmarks.
+Deterministic for a given seed so runs on different commits are comparable.
+"""
+
+import os
+import random
+from typing import List, Dict, Any
+
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'ne', 'ro', 'ta', 'vi', 'zu', 'pre', 'sen', 'dor', 'fix',
+    'gra', 'hel', 'jin', 'kor', 'lum', 'mar', 'nix', 'pol', 'qua', 'res', 'tor',
+    'vel', 'wen', 'xar', 'yol', 'zen', 'fire', 'fox', 'code', 'term', 'word'
+]
+
+APP_WORDS = [
+    'Firefox', 'Files', 'Terminal', 'Text Editor', 'Visual Studio Code', 'GIMP',
+    'LibreOffice Writer', 'LibreOffice Calc', 'Calculator', 'Settings', 'Thunderbird',
+    'VLC Media Player', 'Inkscape', 'Blender', 'Steam', 'Discord', 'Spotify',
+    'System Monitor', 'Disk Usage Analyzer', 'Image Viewer', 'Document Viewer'
+]
+
+CATEGORIES = ['Utility', 'Development', 'Graphics', 'Network', 'Office', 'AudioVideo', 'System', 'Game']
+
+EXTENSIONS = [
+    '.pdf', '.txt', '.md', '.py', '.js', '.png', '.jpg', '.mp3', '.mp4', '.docx',
+    '.xlsx', '.zip', '.tar.gz', '.json', '.csv', ''
+]
+
+DIR_NAMES = ['Documents', 'Downloads', 'Projects', 'Pictures', 'Music', 'Videos', 'Desktop', 'notes', 'src', 'archive']
+
+
+def make_word(rng: random.Random) -> str:
+    """A pronounceable pseudo-word of 1-4 syllables."""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+
+
+def make_file_name(rng: random.Random) -> str:
+    """A file name shaped like real ones: words, separators, numbers, extension."""
+    parts = [make_word(rng) for _ in range(rng.randint(1, 3))]
+    name = rng.choice(['_', '-', ' ', '']).join(parts)
+    if rng.random() < 0.3:
+        name += f"{rng.randint(1, 2025)}"
+    if rng.random() < 0.2:
+        name = name.title()
+    return name + rng.choice(EXTENSIONS)
+
+
+def make_app_names(count: int, rng: random.Random) -> List[str]:
+    """Well-known application names followed by synthetic ones."""
+    names = APP_WORDS[:count]
+    while len(names) < count:
+        names.append(' '.join(make_word(rng).title() for _ in range(rng.randint(1, 2))))
+    return names
+
+
+def write_desktop_files(directory: str, count: int, seed: int = 0) -> List[str]:
+    """Write `count` .desktop files into directory; returns the app names."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    names = make_app_names(count, rng)
+    
+    for i, name in enumerate(names):
+        command = name.lower().replace(' ', '-')
+        with open(os.path.join(directory, f"app{i:06d}-{command}.desktop"), 'w') as f:
+            f.write(
+                "[Desktop Entry]\n"
+                "Type=Application\n"
+                f"Name={name}\n"
+                f"Comment={make_word(rng).title()} {make_word(rng)} tool\n"
+                f"Exec={command} %U\n"
+                f"Icon={command}\n"
+                f"Categories={rng.choice(CATEGORIES)};{rng.choice(CATEGORIES)};\n"
+                f"Keywords={make_word(rng)};{make_word(rng)};\n"
+            )
+    
+    return names
+
+
+def make_file_records(count: int, seed: int = 0, home: str = '/home/bench') -> List[Dict[str, Any]]:
+    """File records as the indexer stores them, spread over nested directories."""
+    rng = random.Random(seed)
+    
+    dirs = [home]
+    for top in DIR_NAMES:
+        dirs.append(f"{home}/{top}")
+    while len(dirs) < max(count // 40, len(DIR_NAMES) + 1):
+        dirs.append(f"{rng.choice(dirs)}/{make_word(rng)}")
+    
+    records = []
+    for _ in range(count):
+        name = make_file_name(rng)
+        records.append({
+            'type': 'file',
+            'name': name,
+            'path': f"{rng.choice(dirs)}/{name}",
+            'mtime': 1.7e9 + rng.random() * 1e7,
+            'size': int(rng.lognormvariate(10, 2))
+        })
+    
+    return records
+
+
+def keystroke_sequences(targets: List[str], count: int, seed: int = 0) -> List[List[str]]:
+    """
+    Queries a user produces while typing towards a target: mostly prefix
+    extensions, sometimes a typo followed by a backspace.
+    """
+    rng = random.Random(seed)
+    sequences = []
+    
+    for _ in range(count):
+        target = rng.choice(targets).lower()
+        target = target[:rng.randint(min(3, len(target)), min(len(target), 12))]
+        
+        queries = []
+        typed = ''
+        for ch in target:
+            if rng.random() < 0.08:
+                queries.append(typed + rng.choice('qxzj'))
+            typed += ch
+            queries.append(typed)
+        sequences.append(queries)
+    
+    return sequences
+
+
+def make_tree(root: str, file_count: int, depth: int = 4, fanout: int = 6, seed: int = 0) -> Dict[str, int]:
+    """
+    Create a directory tree under root holding `file_count` empty files,
+    `fanout` subdirectories per directory down to `depth` levels.
+    Returns the number of directories and files created.
+    """
+    rng = random.Random(seed)
+    
+    levels = [[root]]
+    os.makedirs(root, exist_ok=True)
+    for _ in range(1, depth):
+        level = []
+        for parent in levels[-1]:
+            for i in range(fanout):
+                path = os.path.join(parent, f"{make_word(rng)}{i}")
+                os.mkdir(path)
+                level.append(path)
+        levels.append(level)
+    
+    dirs = [path for level in levels for path in level]
+    for i in range(file_count):
+        directory = dirs[i % len(dirs)]
+        name = make_file_name(rng)
+        # Keep names unique inside a directory
+        with open(os.path.join(directory, f"{i}-{name}"), 'wb'):
+            pass
+    
+    return {'dirs': len(dirs), 'files': file_count}
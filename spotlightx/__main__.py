@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Command line entry point.
+
+    python -m spotlightx                  start the launcher (see spotlightx.main)
+    python -m spotlightx query firefox    print results without a window
+    python -m spotlightx batch < queries  one NDJSON line per query on stdin
+
+query and batch never import Tk, so they run on headless machines and in CI.
+"""
+
+import sys
+import json
+import argparse
+import contextlib
+
+HEADLESS_COMMANDS = ('query', 'batch')
+
+
+def headless_main(argv) -> int:
+    """Run the query or batch command."""
+    parser = argparse.ArgumentParser(prog='python -m spotlightx', description='Query the SpotlightX index without a window.')
+    parser.add_argument('command', choices=HEADLESS_COMMANDS)
+    parser.add_argument('query', nargs='*', help='search text for the query command')
+    parser.add_argument('--limit', type=int, default=12, help='maximum number of results per query')
+    parser.add_argument('--json', action='store_true', help='query: print the results as JSON')
+    parser.add_argument('--plugins', action='store_true', help='also ask the installed plugins')
+    parser.add_argument('--refresh', action='store_true', help='re-index before querying')
+    parser.add_argument('--cache-dir', help='index cache directory (default ~/.cache/spotlightx)')
+    args = parser.parse_intermixed_args(argv)
+    
+    from spotlightx.headless import HeadlessSpotlightX
+    
+    # Indexer and plugin chatter goes to stderr; stdout carries only results
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        with HeadlessSpotlightX(cache_dir=args.cache_dir, plugins=args.plugins, refresh=args.refresh) as app:
+            if args.command == 'query':
+                results = app.query(' '.join(args.query), args.limit)
+                if args.json:
+                    out.write(json.dumps(results, indent=2) + '\n')
+                    return 0
+                for result in results:
+                    subtitle = result.get('subtitle', '')
+                    out.write(f"{result.get('name', '')}\t{subtitle}\n" if subtitle else f"{result.get('name', '')}\n")
+                return 0
+            
+            queries = (line.rstrip('\n') for line in sys.stdin)
+            for record in app.batch((query for query in queries if query.strip()), args.limit):
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+    return 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in HEADLESS_COMMANDS:
+        return headless_main(argv)
+    
+    from spotlightx.main import main as launcher_main
+    sys.argv[1:] = argv
+    launcher_main()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Cache format module for SpotlightX.
+Compact columnar on-disk tables, decoded column by column on load.
+
+Layout (little-endian):
+    header     magic b'SPXC', format version (u16), column count (u32)
+    directory  per column: name length (u16), name (utf-8), kind (u8),
+               row count (u64), payload size (u64)
+    payloads   one per column, each starting on an 8-byte boundary
+
+String columns are a single utf-8 string table with rows separated by NUL.
+List columns store each row as its elements followed by a unit separator.
+Numeric columns are packed arrays.
+
+Loading reads the file once and decodes every column: a string column is
+one utf-8 decode and split, a numeric column one copy into an array.
+Loading is O(n) with a small constant; nothing is decoded lazily.
+"""
+
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+
+MAGIC = b'SPXC'
+FORMAT_VERSION = 1
+
+KIND_STR = 1
+KIND_STRLIST = 2
+KIND_F64 = 3
+KIND_I64 = 4
+KIND_U32 = 5
+
+_ARRAY_TYPECODES = {
+    KIND_F64: 'd',
+    KIND_I64: 'q',
+    KIND_U32: 'I'
+}
+
+_HEADER = struct.Struct('<4sHI')
+_COLUMN = struct.Struct('<BQQ')
+_NAME_LENGTH = struct.Struct('<H')
+
+_ROW_SEP = '\0'
+_ITEM_SEP = '\x1f'
+
+
+class CacheFormatError(ValueError):
+    """Raised when a cache file is not a readable table of this format version."""
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _encode_column(kind: int, values: Sequence[Any]) -> bytes:
+    if kind == KIND_STR:
+        rows = ('' if value is None else str(value).replace(_ROW_SEP, '') for value in values)
+        return _ROW_SEP.join(rows).encode('utf-8')
+
+    if kind == KIND_STRLIST:
+        rows = (''.join(str(item).replace(_ROW_SEP, '').replace(_ITEM_SEP, '') + _ITEM_SEP for item in value or ())
+                for value in values)
+        return _ROW_SEP.join(rows).encode('utf-8')
+
+    if isinstance(values, array):
+        packed = values
+    else:
+        packed = array(_ARRAY_TYPECODES[kind], (value or 0 for value in values))
+    if sys.byteorder == 'big':
+        packed = array(packed.typecode, packed)
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _decode_column(kind: int, rows: int, payload) -> Any:
+    if kind in (KIND_STR, KIND_STRLIST):
+        if rows == 0:
+            return []
+        values = str(payload, 'utf-8').split(_ROW_SEP)
+        if kind == KIND_STRLIST:
+            values = [value.split(_ITEM_SEP)[:-1] for value in values]
+        return values
+
+    if kind not in _ARRAY_TYPECODES:
+        raise CacheFormatError(f"unknown column kind {kind}")
+
+    values = array(_ARRAY_TYPECODES[kind])
+    values.frombytes(payload)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def column_kind(values: Sequence[Any]) -> int:
+    """Infer the column kind for a list of Python values."""
+    if isinstance(values, array):
+        return {'d': KIND_F64, 'q': KIND_I64, 'I': KIND_U32}[values.typecode]
+
+    kind = None
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            return KIND_STRLIST
+        if isinstance(value, float):
+            kind = KIND_F64
+        elif isinstance(value, int) and not isinstance(value, bool):
+            kind = kind or KIND_I64
+        else:
+            return KIND_STR
+    return kind or KIND_STR
+
+
+def write_table(path: Path, columns: Dict[str, Sequence[Any]]):
+    """Atomically write named columns to path. Columns may differ in length."""
+    encoded = []
+    for name, values in columns.items():
+        kind = column_kind(values)
+        encoded.append((name.encode('utf-8'), kind, len(values), _encode_column(kind, values)))
+
+    header = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded)))
+    for name, kind, rows, payload in encoded:
+        header += _NAME_LENGTH.pack(len(name)) + name
+        header += _COLUMN.pack(kind, rows, len(payload))
+    header += b'\0' * _pad(len(header))
+
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for _, _, _, payload in encoded:
+            f.write(payload)
+            f.write(b'\0' * _pad(len(payload)))
+    os.replace(tmp_path, path)
+
+
+def read_table(path: Path) -> Dict[str, Any]:
+    """Read a table written by write_table and decode its columns."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise CacheFormatError("truncated header")
+
+    try:
+        magic, version, count = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise CacheFormatError("not a SpotlightX cache file")
+        if version != FORMAT_VERSION:
+            raise CacheFormatError(f"unsupported cache version {version}")
+
+        offset = _HEADER.size
+        directory = []
+        for _ in range(count):
+            (name_length,) = _NAME_LENGTH.unpack_from(data, offset)
+            offset += _NAME_LENGTH.size
+            name = data[offset:offset + name_length].decode('utf-8')
+            offset += name_length
+            kind, rows, size = _COLUMN.unpack_from(data, offset)
+            offset += _COLUMN.size
+            directory.append((name, kind, rows, size))
+        offset += _pad(offset)
+
+        columns = {}
+        view = memoryview(data)
+        try:
+            for name, kind, rows, size in directory:
+                if offset + size > len(data):
+                    raise CacheFormatError(f"truncated column {name}")
+                columns[name] = _decode_column(kind, rows, view[offset:offset + size])
+                offset += size + _pad(size)
+        finally:
+            view.release()
+        return columns
+    except struct.error as e:
+        raise CacheFormatError(str(e))
+
+
+def columns_from_records(records: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Split a list of dicts into columns, one per key."""
+    keys = {}
+    for record in records:
+        for key in record:
+            keys.setdefault(key, None)
+    return {key: [record.get(key) for record in records] for key in keys}
+
+
+def records_from_columns(columns: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Zip equally long columns back into a list of dicts."""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*columns.values())]
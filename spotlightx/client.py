@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Client for a running SpotlightX instance.
+
+    python -m spotlightx.client toggle
+    python -m spotlightx.client query firefox
+
+Only the standard library is imported, so a hotkey bound to this command
+reaches the resident instance without loading the index, plugins or Tk.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from spotlightx.ipc import send, socket_path
+
+
+def start_instance(show: bool):
+    """Start a resident instance in the background."""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+    
+    command = [sys.executable, '-m', 'spotlightx.main', '--daemon']
+    if show:
+        command.append('--show')
+    subprocess.Popen(
+        command,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m spotlightx.client', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('command', choices=['toggle', 'show', 'hide', 'query', 'ping', 'quit'])
+    parser.add_argument('query', nargs='*', help='search text for the query command')
+    parser.add_argument('--limit', type=int, default=12, help='maximum number of query results')
+    parser.add_argument('--json', action='store_true', help='print the raw reply as JSON')
+    parser.add_argument('--no-start', action='store_true',
+                        help='do not start an instance for toggle/show if none is running')
+    parser.add_argument('--timeout', type=float, default=5.0)
+    args = parser.parse_intermixed_args(argv)
+    
+    fields = {}
+    if args.command == 'query':
+        fields = {'query': ' '.join(args.query), 'limit': args.limit}
+    
+    reply = send(args.command, timeout=args.timeout, **fields)
+    if reply is None:
+        if args.command in ('toggle', 'show') and not args.no_start:
+            start_instance(show=True)
+            return 0
+        print(f"SpotlightX is not running (no socket at {socket_path()})", file=sys.stderr)
+        return 1
+    
+    if args.json:
+        print(json.dumps(reply, indent=2))
+    elif not reply.get('ok'):
+        print(f"Error: {reply.get('error', 'unknown error')}", file=sys.stderr)
+    elif args.command == 'ping':
+        print(f"SpotlightX is running (pid {reply.get('pid')})")
+    elif args.command == 'query':
+        for result in reply.get('results', []):
+            subtitle = result.get('subtitle', '')
+            print(f"{result.get('name', '')}\t{subtitle}" if subtitle else result.get('name', ''))
+    
+    return 0 if reply.get('ok') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
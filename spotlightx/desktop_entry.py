@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Desktop entry module for SpotlightX.
+Streaming parser for the [Desktop Entry] group of .desktop files.
+"""
+
+import os
+import shutil
+from typing import Dict, Any, List, Optional, Sequence
+
+GROUP = '[Desktop Entry]'
+
+# Keys read from the [Desktop Entry] group; everything else is skipped
+KEYS = frozenset((
+    'Type', 'Name', 'Comment', 'Exec', 'TryExec', 'Icon', 'Categories',
+    'Keywords', 'NoDisplay', 'Hidden', 'OnlyShowIn', 'NotShowIn', 'Actions'
+))
+LOCALIZED_KEYS = frozenset(('Name', 'Comment', 'Keywords'))
+
+_ESCAPES = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+
+
+def current_locales(environ=None) -> List[str]:
+    """
+    Locale suffixes to try for localized keys, best match first:
+    lang_COUNTRY@MODIFIER, lang_COUNTRY, lang@MODIFIER, lang.
+    """
+    environ = os.environ if environ is None else environ
+    value = ''
+    for variable in ('LC_ALL', 'LC_MESSAGES', 'LANG'):
+        value = environ.get(variable, '')
+        if value:
+            break
+    if not value or value in ('C', 'POSIX'):
+        return []
+    
+    value, _, modifier = value.partition('@')
+    value = value.partition('.')[0]
+    lang, _, country = value.partition('_')
+    
+    locales = []
+    if country and modifier:
+        locales.append(f"{lang}_{country}@{modifier}")
+    if country:
+        locales.append(f"{lang}_{country}")
+    if modifier:
+        locales.append(f"{lang}@{modifier}")
+    locales.append(lang)
+    return locales
+
+
+def current_desktops(environ=None) -> List[str]:
+    """Desktop names from XDG_CURRENT_DESKTOP, compared case-insensitively."""
+    environ = os.environ if environ is None else environ
+    return [name.lower() for name in environ.get('XDG_CURRENT_DESKTOP', '').split(':') if name]
+
+
+def unescape(value: str) -> str:
+    """Resolve the \\s, \\n, \\t, \\r and \\\\ escapes of a string value."""
+    if '\\' not in value:
+        return value
+    out = []
+    i = 0
+    while i < len(value):
+        char = value[i]
+        if char == '\\' and i + 1 < len(value):
+            out.append(_ESCAPES.get(value[i + 1], char + value[i + 1]))
+            i += 2
+        else:
+            out.append(char)
+            i += 1
+    return ''.join(out)
+
+
+def split_list(value: str) -> List[str]:
+    """Split a ';'-separated list value, honouring escaped semicolons."""
+    if not value:
+        return []
+    if '\\;' not in value:
+        return [item for item in value.split(';') if item]
+    items = value.replace('\\;', '\0').split(';')
+    return [item.replace('\0', ';') for item in items if item]
+
+
+def _executable(command: str) -> bool:
+    if os.path.isabs(command):
+        return os.access(command, os.X_OK)
+    return shutil.which(command) is not None
+
+
+def read_entry(filepath: str, locales: Sequence[str] = ()) -> Optional[Dict[str, str]]:
+    """
+    Read the wanted keys of the [Desktop Entry] group, stopping at the next group.
+    Localized keys resolve to the best matching locale in `locales`.
+    Returns None if the file has no [Desktop Entry] group.
+    """
+    # Lower rank is a better locale match; the unlocalized value ranks last
+    ranks = {locale: rank for rank, locale in enumerate(locales)}
+    default_rank = len(ranks)
+    values = {}
+    value_ranks = {}
+    in_group = False
+    
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+            
+            if line[0] == '[':
+                if in_group:
+                    break
+                in_group = line == GROUP
+                continue
+            
+            if not in_group:
+                continue
+            
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = key.rstrip()
+            
+            if key[-1:] == ']':
+                key, _, locale = key[:-1].partition('[')
+                if key not in LOCALIZED_KEYS or locale not in ranks:
+                    continue
+                rank = ranks[locale]
+            else:
+                if key not in KEYS:
+                    continue
+                rank = default_rank
+            
+            if rank <= value_ranks.get(key, default_rank):
+                values[key] = value.lstrip()
+                value_ranks[key] = rank
+    
+    return values if in_group else None
+
+
+def parse_desktop_entry(filepath: str, locales: Sequence[str] = (),
+                        desktops: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse a .desktop file into an app record.
+    Returns None for entries that should not be listed: non-applications,
+    NoDisplay/Hidden entries, entries whose TryExec is missing and entries
+    excluded by OnlyShowIn/NotShowIn for the current desktop.
+    """
+    entry = read_entry(filepath, locales)
+    if entry is None:
+        return None
+    
+    if entry.get('Type', 'Application') != 'Application':
+        return None
+    
+    if entry.get('NoDisplay', 'false').lower() == 'true':
+        return None
+    
+    if entry.get('Hidden', 'false').lower() == 'true':
+        return None
+    
+    name = unescape(entry.get('Name', ''))
+    if not name:
+        return None
+    
+    if desktops is None:
+        desktops = current_desktops()
+    only_show_in = split_list(entry.get('OnlyShowIn', ''))
+    if only_show_in and not any(desktop.lower() in desktops for desktop in only_show_in):
+        return None
+    if any(desktop.lower() in desktops for desktop in split_list(entry.get('NotShowIn', ''))):
+        return None
+    
+    try_exec = unescape(entry.get('TryExec', ''))
+    if try_exec and not _executable(try_exec):
+        return None
+    
+    return {
+        'type': 'app',
+        'name': name,
+        'exec': entry.get('Exec', ''),
+        'icon': unescape(entry.get('Icon', '')),
+        'comment': unescape(entry.get('Comment', '')),
+        'categories': split_list(entry.get('Categories', '')),
+        'path': filepath,
+        'keywords': [unescape(keyword) for keyword in split_list(entry.get('Keywords', ''))],
+        'actions': split_list(entry.get('Actions', ''))
+    }
@@ -33,6 +33,8 @@ import subprocess
 import shlex
 from typing import Optional
 
+from .metrics import span
+
 
 class Executor:
     def __init__(self):
@@ -100,6 +102,10 @@ class Executor:
     
     def execute(self, item: dict) -> bool:
         """Execute an item based on its type."""
+        with span('execute'):
+            return self._execute(item)
+    
+    def _execute(self, item: dict) -> bool:
         item_type = item.get('type', '')
         action = item.get('action', '')
         
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+File table module for SpotlightX.
+Compact struct-of-arrays storage for indexed files.
+"""
+
+import os
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+
+def _as_array(typecode: str, values: Sequence[Any]) -> array:
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    return array(typecode, values)
+
+
+class FileTable:
+    """
+    Indexed files stored as parallel columns instead of one dict per file.
+
+    Directories are interned, so each file only costs its name, a directory
+    id, its mtime and its size. Indexing or iterating yields plain item dicts,
+    built on demand, so callers that expect a list of dicts keep working.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.dir_ids = array('I')
+        self.mtimes = array('d')
+        self.sizes = array('q')
+        self.dirs: List[str] = []
+        self._dir_lookup: Dict[str, int] = {}
+        self._by_name: Optional[Dict[str, Union[int, List[int]]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, idx: int) -> Dict[str, Any]:
+        return {
+            'type': 'file',
+            'name': self.names[idx],
+            'path': self.path(idx),
+            'mtime': self.mtimes[idx],
+            'size': self.sizes[idx]
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for idx in range(len(self.names)):
+            yield self[idx]
+
+    def path(self, idx: int) -> str:
+        """Return the full path of the file at idx."""
+        return os.path.join(self.dirs[self.dir_ids[idx]], self.names[idx])
+
+    def intern_dir(self, dirpath: str) -> int:
+        """Return the id of a directory, adding it if needed."""
+        dir_id = self._dir_lookup.get(dirpath)
+        if dir_id is None:
+            dir_id = self._dir_lookup[dirpath] = len(self.dirs)
+            self.dirs.append(dirpath)
+        return dir_id
+
+    def add(self, dirpath: str, name: str, mtime: float, size: int) -> int:
+        """Append a file and return its position."""
+        idx = len(self.names)
+        self.names.append(name)
+        self.dir_ids.append(self.intern_dir(dirpath))
+        self.mtimes.append(mtime)
+        self.sizes.append(size)
+        if self._by_name is not None:
+            self._link(name, idx)
+        return idx
+
+    def append(self, item: Dict[str, Any]) -> int:
+        """Append an item dict and return its position."""
+        dirpath, name = os.path.split(item['path'])
+        return self.add(dirpath, name, item.get('mtime', 0.0), item.get('size', 0))
+
+    def update(self, idx: int, item: Dict[str, Any]):
+        """Update the mtime and size of the file at idx from an item dict."""
+        self.mtimes[idx] = item.get('mtime', 0.0)
+        self.sizes[idx] = item.get('size', 0)
+
+    def swap_remove(self, idx: int):
+        """Remove the file at idx by moving the last file into its slot."""
+        last = len(self.names) - 1
+        if self._by_name is not None:
+            self._unlink(self.names[idx], idx)
+            if idx != last:
+                self._unlink(self.names[last], last)
+                self._link(self.names[last], idx)
+
+        for column in (self.names, self.dir_ids, self.mtimes, self.sizes):
+            if idx != last:
+                column[idx] = column[last]
+            column.pop()
+
+    def truncate(self, length: int):
+        """Drop every file from position length on."""
+        for column in (self.names, self.dir_ids, self.mtimes, self.sizes):
+            del column[length:]
+        self._by_name = None
+
+    def position_of(self, path: str) -> Optional[int]:
+        """Return the position of a file by path, or None."""
+        if self._by_name is None:
+            self._by_name = {}
+            for idx, name in enumerate(self.names):
+                self._link(name, idx)
+
+        dirpath, name = os.path.split(path)
+        dir_id = self._dir_lookup.get(dirpath)
+        if dir_id is None:
+            return None
+
+        found = self._by_name.get(name)
+        for idx in (found if isinstance(found, list) else (found,)):
+            if idx is not None and self.dir_ids[idx] == dir_id:
+                return idx
+        return None
+
+    def positions_under(self, dirpath: str) -> List[int]:
+        """Return the positions of all files in dirpath or below it."""
+        prefix = dirpath + os.sep
+        dir_ids = {dir_id for dir_id, path in enumerate(self.dirs) if path == dirpath or path.startswith(prefix)}
+        return [idx for idx, dir_id in enumerate(self.dir_ids) if dir_id in dir_ids]
+
+    def _link(self, name: str, idx: int):
+        found = self._by_name.get(name)
+        if found is None:
+            self._by_name[name] = idx
+        elif isinstance(found, list):
+            found.append(idx)
+        else:
+            self._by_name[name] = [found, idx]
+
+    def _unlink(self, name: str, idx: int):
+        found = self._by_name.get(name)
+        if isinstance(found, list):
+            found.remove(idx)
+            if len(found) == 1:
+                self._by_name[name] = found[0]
+        elif found == idx:
+            del self._by_name[name]
+
+    def to_columns(self) -> Dict[str, Sequence[Any]]:
+        """Return the table as named columns for cache_format.write_table."""
+        return {
+            'name': self.names,
+            'dir_id': self.dir_ids,
+            'mtime': self.mtimes,
+            'size': self.sizes,
+            'dir': self.dirs
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[Any]]) -> 'FileTable':
+        """Build a table from columns written by to_columns, or from path-based item columns."""
+        if 'dir_id' not in columns:
+            return cls.from_records(
+                {'path': path, 'mtime': mtime, 'size': size}
+                for path, mtime, size in zip(columns['path'], columns['mtime'], columns['size'])
+            )
+
+        table = cls()
+        table.names = list(columns['name'])
+        table.dir_ids = _as_array('I', columns['dir_id'])
+        table.mtimes = _as_array('d', columns['mtime'])
+        table.sizes = _as_array('q', columns['size'])
+        table.dirs = list(columns['dir'])
+        table._dir_lookup = {dirpath: dir_id for dir_id, dirpath in enumerate(table.dirs)}
+        return table
+
+    @classmethod
+    def from_records(cls, items) -> 'FileTable':
+        """Build a table from file item dicts."""
+        table = cls()
+        for item in items:
+            table.append(item)
+        return table
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Frecency module for SpotlightX.
+Exponentially time-decayed usage scores and per-corpus boost vectors.
+"""
+
+import math
+import time
+import threading
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+
+SECONDS_PER_DAY = 86400.0
+
+
+def decayed(score: float, since: float, now: float, half_life_days: float) -> float:
+    """Decay a score recorded at `since` to `now`."""
+    if half_life_days <= 0:
+        return score
+    elapsed = max(now - since, 0.0)
+    return score * 0.5 ** (elapsed / (half_life_days * SECONDS_PER_DAY))
+
+
+def current_frecency(usage: Dict[str, Any], now: float, half_life_days: float) -> float:
+    """
+    Frecency of a usage entry at `now`.
+    Entries written before frecency was tracked count every use at last_used.
+    """
+    score = usage.get('frecency', usage.get('count', 0))
+    return decayed(score, usage.get('last_used', 0), now, half_life_days)
+
+
+class Frecency:
+    """
+    Decayed usage scores of indexed items.
+    
+    Every use adds 1 to an item's score, which halves every
+    half_life_days. Scores are stored with the usage entries as of their
+    last use. Boost vectors are aligned with the corpus positions so
+    search reads them without looking items up.
+    """
+    
+    def __init__(self, indexer, half_life_days: float = 30.0, refresh_seconds: float = 3600.0):
+        self.indexer = indexer
+        self.half_life_days = half_life_days
+        # Decay is slow, so vectors are only recomputed this often
+        self.refresh_seconds = refresh_seconds
+        
+        # kind -> (key, built_at, boosts, max boost, boosted positions)
+        self._vectors = {}
+        self._lock = threading.Lock()
+    
+    def record(self, item_id: str, when: Optional[float] = None):
+        """Count one use of an item and update its boost in place."""
+        if when is None:
+            when = time.time()
+        
+        usage = self.indexer.usage.get(item_id)
+        frecency = current_frecency(usage, when, self.half_life_days) + 1.0
+        
+        with self._lock:
+            self.indexer.usage.record(item_id, when, frecency=frecency)
+            
+            for kind, (key, built_at, boosts, max_boost, boosted) in list(self._vectors.items()):
+                if key[0] != self.indexer.generation:
+                    continue
+                idx = self.indexer.position_of(kind, item_id)
+                if idx is None or idx >= len(boosts):
+                    continue
+                weight = key[1]
+                boost = weight * math.log(decayed(frecency, when, built_at, self.half_life_days) + 1)
+                if boosts[idx] == 0:
+                    boosted = boosted + [idx]
+                boosts[idx] = boost
+                self._vectors[kind] = (key, built_at, boosts, max(max_boost, boost), boosted)
+    
+    def score(self, item_id: str, now: Optional[float] = None) -> float:
+        """Current frecency of a single item."""
+        if now is None:
+            now = time.time()
+        return current_frecency(self.indexer.usage.get(item_id), now, self.half_life_days)
+    
+    def boosts(self, kind: str, weight: float) -> Tuple[array, float]:
+        """
+        Boost vector for a corpus: weight * log(frecency + 1) per position,
+        and its largest value. Rebuilt when the index changes.
+        """
+        key = (self.indexer.generation, weight, self.half_life_days)
+        now = time.time()
+        
+        vector = self._vectors.get(kind)
+        if vector is not None and vector[0] == key and now - vector[1] < self.refresh_seconds:
+            return vector[2], vector[3]
+        
+        with self._lock:
+            vector = self._build(kind, key, now)
+        return vector[2], vector[3]
+    
+    def boosted(self, kind: str) -> List[int]:
+        """Positions with a non-zero boost in the last vector returned by boosts()."""
+        vector = self._vectors.get(kind)
+        return vector[4] if vector is not None else []
+    
+    def _build(self, kind: str, key: tuple, now: float) -> tuple:
+        weight = key[1]
+        size = len(self.indexer.get_apps() if kind == 'app' else self.indexer.get_files())
+        boosts = array('d', bytes(8 * size))
+        max_boost = 0.0
+        boosted = []
+        
+        for item_id, usage in list(self.indexer.usage_data.items()):
+            idx = self.indexer.position_of(kind, item_id)
+            if idx is None or idx >= size:
+                continue
+            frecency = current_frecency(usage, now, self.half_life_days)
+            if frecency <= 0:
+                continue
+            boost = weight * math.log(frecency + 1)
+            boosts[idx] = boost
+            max_boost = max(max_boost, boost)
+            boosted.append(idx)
+        
+        vector = (key, now, boosts, max_boost, boosted)
+        self._vectors[kind] = vector
+        return vector
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Headless module for SpotlightX.
+Query the index, search engine and plugins without a window, from scripts or CI.
+"""
+
+import time
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from .indexer import Indexer
+from .plugin_manager import PluginManager
+from .search import SearchEngine
+
+# Result fields handed to scripts and IPC clients
+RESULT_FIELDS = ('type', 'name', 'subtitle', 'action', 'path', 'icon', 'score')
+
+
+def public_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The JSON-friendly fields of a result dict."""
+    return {field: result[field] for field in RESULT_FIELDS if field in result}
+
+
+class HeadlessSpotlightX:
+    """
+    Indexer, search engine and (optionally) plugins, without Tk.
+    
+    Uses the on-disk caches; indexes synchronously when there are none or
+    when refresh is set. Usable as a context manager.
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None, plugins: bool = False,
+                 refresh: bool = False, plugin_config_dir: Optional[str] = None):
+        # Usage belongs to the app, which may be running on the same cache
+        self.indexer = Indexer(cache_dir=cache_dir, read_only_usage=True)
+        self.search_engine = SearchEngine(self.indexer)
+        self.plugin_manager = None
+        
+        if plugins:
+            self.plugin_manager = PluginManager(plugin_config_dir)
+            self.plugin_manager.load_all_plugins(defer=True)
+            self.plugin_manager.load_pending_plugins()
+            self.plugin_manager.trigger_hook('on_startup')
+        
+        if refresh or not (self.indexer.get_apps() or self.indexer.get_files()):
+            self.indexer.index_all()
+    
+    def query(self, query: str, limit: int = 12) -> List[Dict[str, Any]]:
+        """Results for one query, best first, as plain dicts."""
+        plugin_batch = []
+        if self.plugin_manager is not None:
+            plugin_batch = self.plugin_manager.submit_query_hooks(query)
+        
+        results = self.search_engine.search(query, max_results=limit)
+        
+        if self.plugin_manager is not None:
+            for plugin_result in self.plugin_manager.collect_query_hooks(plugin_batch):
+                if isinstance(plugin_result, list):
+                    results.extend(plugin_result)
+        
+        results.sort(key=lambda x: x.get('score', 0), reverse=True)
+        return [public_result(result) for result in results[:limit]]
+    
+    def batch(self, queries: Iterable[str], limit: int = 12) -> Iterator[Dict[str, Any]]:
+        """Run queries one after another, yielding each one's results and latency."""
+        for query in queries:
+            start = time.perf_counter()
+            results = self.query(query, limit)
+            yield {
+                'query': query,
+                'ms': (time.perf_counter() - start) * 1000,
+                'results': results
+            }
+    
+    def close(self):
+        """Stop plugins and workers and release the caches."""
+        if self.plugin_manager is not None:
+            self.plugin_manager.trigger_hook('on_shutdown')
+            self.plugin_manager.shutdown()
+        self.search_engine.close()
+        self.indexer.close()
+    
+    def __enter__(self) -> 'HeadlessSpotlightX':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -29,28 +29,64 @@ Scans .desktop files and file system, creates JSON cache.
 
 import os
 import json
-import time
 import threading
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import configparser
+from typing import List, Dict, Any, Iterable, Optional
+
+from .cache_format import CacheFormatError, columns_from_records, read_table, records_from_columns, write_table
+from .desktop_entry import current_desktops, current_locales, parse_desktop_entry
+from .file_table import FileTable
+from .frecency import Frecency
+from .metrics import span
+from .name_index import NameIndex
+from .search_keys import FieldKeys, normalize
+from .usage_store import UsageStore
 
 
 class Indexer:
-    def __init__(self, cache_dir: Optional[str] = None):
+    def __init__(self, cache_dir: Optional[str] = None, watch: bool = False,
+                 read_only_usage: bool = False):
         if cache_dir is None:
             cache_dir = os.path.expanduser("~/.cache/spotlightx")
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        self.apps_cache_file = self.cache_dir / "apps.json"
-        self.files_cache_file = self.cache_dir / "files.json"
+        self.apps_cache_file = self.cache_dir / "apps.bin"
+        self.files_cache_file = self.cache_dir / "files.bin"
+        self.legacy_apps_cache_file = self.cache_dir / "apps.json"
+        self.legacy_files_cache_file = self.cache_dir / "files.json"
         self.usage_cache_file = self.cache_dir / "usage.json"
+        self.usage_log_file = self.cache_dir / "usage.log"
+        self.apps_index_file = self.cache_dir / "apps.idx"
+        self.files_index_file = self.cache_dir / "files.idx"
+        self.files_journal_file = self.cache_dir / "files.delta"
+        self.dirs_cache_file = self.cache_dir / "dirs.json"
         
         self.apps_data = []
-        self.files_data = []
-        self.usage_data = {}
+        self.files_data = FileTable()
+        # Headless runs share the cache with a running instance; only the
+        # instance writes usage, or compacting would drop its log entries
+        self.usage = UsageStore(self.usage_cache_file, self.usage_log_file, read_only=read_only_usage)
+        self.usage_data = self.usage.data
+        self.frecency = Frecency(self)
+        self.apps_index = NameIndex()
+        self.apps_keys = FieldKeys()
+        self.files_index = NameIndex()
+        self.dir_mtimes = {}
+        # The file cap of the walk dir_mtimes came from, and whether the
+        # index has left out files because of it
+        self.indexed_max_files = None
+        self.files_truncated = False
+        # path -> (mtime, app record or None) of every parsed .desktop file
+        self.desktop_entries = {}
+        # Application directory -> mtime when it was last listed
+        self.desktop_dir_mtimes = {}
+        # Locales and desktops the entries were parsed for
+        self.desktop_context = None
         
         self.desktop_paths = [
             "/usr/share/applications",
@@ -71,153 +107,447 @@ class Indexer:
             os.path.expanduser("~"),
         ]
         
+        self.max_depth = 4
+        self.max_files = 20000
+        self.walk_workers = min(16, (os.cpu_count() or 1) * 2)
+        
         self.indexing = False
+        self.generation = 0
+        self.lock = threading.RLock()
+        self.watch = watch
+        self.watcher = None
+        self.apps_lock = threading.Lock()
+        # Package installs touch many .desktop files; refresh once they settle
+        self.apps_refresh_delay = 0.3
+        self._apps_refresh = None
+        self._app_positions = None
+        self._journal = None
+        # Bumped by every change to files_data or dir_mtimes from a delta
+        self._changes = 0
         self.load_caches()
     
     def load_caches(self):
         """Load existing caches from disk."""
         try:
-            if self.apps_cache_file.exists():
-                with open(self.apps_cache_file, 'r') as f:
-                    self.apps_data = json.load(f)
+            self.apps_data = self.unpack_apps_columns(
+                self.load_table(self.apps_cache_file, self.legacy_apps_cache_file)
+            )
         except Exception as e:
             print(f"Error loading apps cache: {e}")
             self.apps_data = []
-        
+
         try:
-            if self.files_cache_file.exists():
-                with open(self.files_cache_file, 'r') as f:
-                    self.files_data = json.load(f)
+            columns = self.load_table(self.files_cache_file, self.legacy_files_cache_file)
+            self.files_data = FileTable.from_columns(columns) if columns else FileTable()
         except Exception as e:
             print(f"Error loading files cache: {e}")
-            self.files_data = []
+            self.files_data = FileTable()
+        
+        self.usage.load()
         
         try:
-            if self.usage_cache_file.exists():
-                with open(self.usage_cache_file, 'r') as f:
-                    self.usage_data = json.load(f)
+            if self.dirs_cache_file.exists():
+                with open(self.dirs_cache_file, 'r') as f:
+                    dirs_cache = json.load(f)
+                if dirs_cache.get('roots') == self.file_roots and dirs_cache.get('max_depth') == self.max_depth:
+                    self.dir_mtimes = dirs_cache.get('dirs', {})
+                    self.indexed_max_files = dirs_cache.get('max_files')
+                    self.files_truncated = dirs_cache.get('truncated', False)
         except Exception as e:
-            print(f"Error loading usage cache: {e}")
-            self.usage_data = {}
+            print(f"Error loading directory cache: {e}")
+            self.dir_mtimes = {}
+        
+        self.apps_index = self.load_name_index(
+            self.apps_index_file, self.apps_cache_file, [app.get('name', '') for app in self.apps_data]
+        )
+        self.apps_keys = FieldKeys.build(self.apps_data)
+        self.files_index = self.load_name_index(self.files_index_file, self.files_cache_file, self.files_data.names)
+        self._app_positions = None
+        
+        try:
+            self.replay_journal()
+        except Exception as e:
+            print(f"Error replaying file index journal: {e}")
+        
+        self.generation += 1
     
     def save_caches(self):
         """Save caches to disk."""
+        with self.lock:
+            self._save_caches()
+    
+    def _save_caches(self):
+        self._save_apps_cache()
+
+        try:
+            write_table(self.files_cache_file, self.files_data.to_columns())
+        except Exception as e:
+            print(f"Error saving files cache: {e}")
+        
+        self.usage.flush()
+        
+        try:
+            with open(self.dirs_cache_file, 'w') as f:
+                json.dump({
+                    'roots': self.file_roots,
+                    'max_depth': self.max_depth,
+                    'max_files': self.indexed_max_files,
+                    'truncated': self.files_truncated,
+                    'dirs': self.dir_mtimes
+                }, f)
+        except Exception as e:
+            print(f"Error saving directory cache: {e}")
+        
+        self.save_name_index(self.files_index, self.files_index_file, self.files_cache_file, self.files_data)
+        
+        # The snapshot now includes every journaled delta
+        self.close_journal()
+        try:
+            self.files_journal_file.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error truncating file index journal: {e}")
+    
+    def _save_apps_cache(self):
         try:
-            with open(self.apps_cache_file, 'w') as f:
-                json.dump(self.apps_data, f, indent=2)
+            write_table(self.apps_cache_file, self.pack_apps_columns())
         except Exception as e:
             print(f"Error saving apps cache: {e}")
         
+        self.save_name_index(self.apps_index, self.apps_index_file, self.apps_cache_file, self.apps_data)
+    
+    def pack_apps_columns(self) -> Dict[str, Any]:
+        """
+        Columns of the apps cache: one row per app, plus every parsed .desktop
+        file and application directory with the mtime it was indexed at.
+        """
+        columns = columns_from_records(self.apps_data)
+        
+        files = list(self.desktop_entries)
+        columns['_desktop_files'] = files
+        columns['_desktop_file_mtimes'] = array('d', (self.desktop_entries[path][0] for path in files))
+        
+        dirs = list(self.desktop_dir_mtimes)
+        columns['_desktop_dirs'] = dirs
+        columns['_desktop_dir_mtimes'] = array('d', (self.desktop_dir_mtimes[path] for path in dirs))
+        
+        if self.desktop_context is not None:
+            columns['_desktop_context'] = [list(part) for part in self.desktop_context]
+        return columns
+    
+    def unpack_apps_columns(self, columns: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Restore the apps and the .desktop file state from the apps cache columns."""
+        files = columns.pop('_desktop_files', [])
+        file_mtimes = columns.pop('_desktop_file_mtimes', [])
+        dirs = columns.pop('_desktop_dirs', [])
+        dir_mtimes = columns.pop('_desktop_dir_mtimes', [])
+        context = columns.pop('_desktop_context', None)
+        
+        apps = records_from_columns(columns)
+        by_path = {app.get('path'): app for app in apps}
+        self.desktop_entries = {path: (mtime, by_path.get(path)) for path, mtime in zip(files, file_mtimes)}
+        self.desktop_dir_mtimes = dict(zip(dirs, dir_mtimes))
+        self.desktop_context = tuple(tuple(part) for part in context) if context else None
+        return apps
+    
+    def load_table(self, cache_file: Path, legacy_file: Path) -> Dict[str, Any]:
+        """
+        Load the columns of a cache table, migrating it from the old JSON cache if needed.
+        A table from an unknown format version is ignored and rebuilt on the next index.
+        """
+        if cache_file.exists():
+            try:
+                return read_table(cache_file)
+            except CacheFormatError as e:
+                print(f"Ignoring cache {cache_file.name}: {e}")
+                return {}
+        
+        if not legacy_file.exists():
+            return {}
+        
+        with open(legacy_file, 'r') as f:
+            columns = columns_from_records(json.load(f))
+        
+        write_table(cache_file, columns)
+        legacy_file.unlink()
+        print(f"Migrated {legacy_file.name} to {cache_file.name}")
+        return columns
+    
+    def _index_fingerprint(self, cache_file: Path, items) -> tuple:
+        """Identify the cached data a name index was built from."""
         try:
-            with open(self.files_cache_file, 'w') as f:
-                json.dump(self.files_data, f, indent=2)
+            mtime = cache_file.stat().st_mtime_ns
+        except OSError:
+            mtime = 0
+        return (len(items), mtime)
+    
+    @staticmethod
+    def search_names(names: Iterable[str]) -> List[str]:
+        """Normalized names for the name index, sharing strings that normalizing leaves unchanged."""
+        lowered = []
+        for name in names:
+            lower = normalize(name)
+            lowered.append(name if lower == name else lower)
+        return lowered
+    
+    def build_name_index(self, names: Iterable[str]) -> NameIndex:
+        """Build the trigram/prefix index over item names."""
+        return NameIndex.build(self.search_names(names))
+    
+    def load_name_index(self, index_file: Path, cache_file: Path, names: List[str]) -> NameIndex:
+        """Load a persisted name index, rebuilding it if it no longer matches the cache."""
+        lowered = self.search_names(names)
+        try:
+            index = NameIndex.load(index_file, self._index_fingerprint(cache_file, names), lowered)
+            if index is not None:
+                return index
         except Exception as e:
-            print(f"Error saving files cache: {e}")
+            print(f"Error loading name index: {e}")
         
+        return NameIndex.build(lowered)
+    
+    def save_name_index(self, index: NameIndex, index_file: Path, cache_file: Path, items: List[Dict[str, Any]]):
+        """Persist a name index next to the cache it was built from."""
         try:
-            with open(self.usage_cache_file, 'w') as f:
-                json.dump(self.usage_data, f, indent=2)
+            index.save(index_file, self._index_fingerprint(cache_file, items))
         except Exception as e:
-            print(f"Error saving usage cache: {e}")
+            print(f"Error saving name index: {e}")
     
-    def parse_desktop_file(self, filepath: str) -> Optional[Dict[str, Any]]:
+    def parse_desktop_file(self, filepath: str, locales: Optional[List[str]] = None,
+                           desktops: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
         """Parse a .desktop file and extract relevant information."""
         try:
-            config = configparser.ConfigParser(interpolation=None)
-            config.read(filepath, encoding='utf-8')
-            
-            if 'Desktop Entry' not in config:
-                return None
-            
-            entry = config['Desktop Entry']
-            
-            if entry.get('NoDisplay', 'false').lower() == 'true':
-                return None
-            
-            if entry.get('Hidden', 'false').lower() == 'true':
-                return None
-            
-            name = entry.get('Name', '')
-            if not name:
-                return None
-            
-            return {
-                'type': 'app',
-                'name': name,
-                'exec': entry.get('Exec', ''),
-                'icon': entry.get('Icon', ''),
-                'comment': entry.get('Comment', ''),
-                'categories': entry.get('Categories', '').split(';'),
-                'path': filepath,
-                'keywords': entry.get('Keywords', '').split(';')
-            }
+            if locales is None:
+                locales = current_locales()
+            return parse_desktop_entry(filepath, locales, desktops)
         except Exception as e:
             return None
     
     def index_applications(self) -> List[Dict[str, Any]]:
-        """Index all .desktop files in standard locations."""
-        apps = []
+        """
+        Index all .desktop files in standard locations.
+        Only new and modified files are parsed, in parallel. Directories whose
+        mtime is unchanged are not listed again: files can only have been
+        edited in place there, which a stat of the known files catches.
+        """
+        with self.apps_lock:
+            return self._index_applications()
+    
+    def _index_applications(self) -> List[Dict[str, Any]]:
+        locales = current_locales()
+        desktops = current_desktops()
+        context = (tuple(locales), tuple(desktops))
+        # Localized names and OnlyShowIn depend on the environment
+        if context == self.desktop_context:
+            cached, cached_dirs = self.desktop_entries, self.desktop_dir_mtimes
+        else:
+            cached, cached_dirs = {}, {}
         
+        known = {}
+        for filepath in cached:
+            known.setdefault(os.path.dirname(filepath), []).append(filepath)
+        
+        candidates = []
+        dir_mtimes = {}
         for desktop_path in self.desktop_paths:
-            if not os.path.exists(desktop_path):
+            try:
+                dir_mtime = os.stat(desktop_path).st_mtime
+            except OSError:
                 continue
             
             try:
-                for filename in os.listdir(desktop_path):
-                    if not filename.endswith('.desktop'):
-                        continue
-                    
-                    filepath = os.path.join(desktop_path, filename)
-                    app_data = self.parse_desktop_file(filepath)
-                    
-                    if app_data:
-                        apps.append(app_data)
+                if cached_dirs.get(desktop_path) == dir_mtime:
+                    candidates.extend(self.stat_desktop_files(known.get(desktop_path, ())))
+                else:
+                    candidates.extend(self.list_desktop_files(desktop_path))
+                dir_mtimes[desktop_path] = dir_mtime
             except Exception as e:
                 print(f"Error indexing {desktop_path}: {e}")
         
+        entries = {}
+        stale = []
+        for filepath, mtime in candidates:
+            hit = cached.get(filepath)
+            if hit is not None and hit[0] == mtime:
+                entries[filepath] = hit
+            else:
+                stale.append((filepath, mtime))
+        
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.walk_workers) as pool:
+                parsed = pool.map(lambda item: self.parse_desktop_file(item[0], locales, desktops), stale)
+                for (filepath, mtime), app_data in zip(stale, parsed):
+                    entries[filepath] = (mtime, app_data)
+        
+        self.desktop_entries = entries
+        self.desktop_dir_mtimes = dir_mtimes
+        self.desktop_context = context
+        
+        apps = []
+        for filepath, _ in candidates:
+            app_data = entries[filepath][1]
+            if app_data:
+                apps.append(app_data)
         return apps
     
-    def index_files(self, max_depth: int = 4, max_files: int = 20000) -> List[Dict[str, Any]]:
-        """Index files in configured root directories."""
+    def list_desktop_files(self, desktop_path: str) -> List[tuple]:
+        """List the .desktop files of a directory as (path, mtime) tuples."""
+        files = []
+        with os.scandir(desktop_path) as it:
+            for entry in it:
+                if not entry.name.endswith('.desktop'):
+                    continue
+                try:
+                    # Follows the symlinks Flatpak exports are made of
+                    files.append((entry.path, entry.stat().st_mtime))
+                except OSError:
+                    continue
+        return files
+    
+    def stat_desktop_files(self, paths: Iterable[str]) -> List[tuple]:
+        """Current (path, mtime) of known .desktop files that still exist."""
+        files = []
+        for path in paths:
+            try:
+                files.append((path, os.stat(path).st_mtime))
+            except OSError:
+                continue
+        return files
+    
+    def refresh_applications(self) -> int:
+        """Re-index applications and swap them in; returns the number of apps."""
+        apps = self.index_applications()
+        apps_index = self.build_name_index(app['name'] for app in apps)
+        apps_keys = FieldKeys.build(apps)
+        with self.lock:
+            self.apps_data, self.apps_index, self.apps_keys = apps, apps_index, apps_keys
+            self._app_positions = None
+            self.generation += 1
+        return len(apps)
+    
+    def schedule_apps_refresh(self):
+        """Refresh applications shortly after an application directory changed."""
+        with self.lock:
+            if self._apps_refresh is not None:
+                self._apps_refresh.cancel()
+            self._apps_refresh = threading.Timer(self.apps_refresh_delay, self._refresh_apps_now)
+            self._apps_refresh.daemon = True
+            self._apps_refresh.start()
+    
+    def _refresh_apps_now(self):
+        with self.lock:
+            self._apps_refresh = None
+        try:
+            count = self.refresh_applications()
+            with self.lock:
+                self._save_apps_cache()
+            print(f"Applications changed, {count} indexed")
+        except Exception as e:
+            print(f"Error refreshing applications: {e}")
+    
+    def scan_directory(self, dirpath: str, descend: bool) -> tuple:
+        """
+        List one directory with os.scandir.
+        Returns its files as (name, mtime, size) tuples and, if descend is set,
+        its visible subdirectories as (path, (st_dev, st_ino), mtime) tuples,
+        both sorted by name.
+        """
         files = []
-        file_count = 0
+        subdirs = []
         
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                
+                try:
+                    if entry.is_dir():
+                        # Like os.walk, never descend into symlinked directories
+                        if descend and not entry.is_symlink():
+                            stat = entry.stat(follow_symlinks=False)
+                            subdirs.append((entry.path, (stat.st_dev, stat.st_ino), stat.st_mtime))
+                        continue
+                    
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                
+                files.append((entry.name, stat.st_mtime, stat.st_size))
+        
+        files.sort()
+        subdirs.sort()
+        return files, subdirs
+    
+    def index_files(self, max_depth: Optional[int] = None, max_files: Optional[int] = None,
+                    dir_mtimes: Optional[Dict[str, float]] = None) -> FileTable:
+        """
+        Index files in configured root directories into a FileTable.
+        Directories are scanned in parallel; each one is scanned at most once,
+        even where roots overlap. Scans are taken in root order, breadth first
+        within a root, so max_files keeps the same files on every run and
+        favours the earlier roots.
+        If dir_mtimes is given, it is filled with the mtime of every scanned directory.
+        """
+        if max_depth is None:
+            max_depth = self.max_depth
+        if max_files is None:
+            max_files = self.max_files
+        
+        files = FileTable()
+        visited = set()
+        roots = []
+        
+        # Claim every root up front so a parent root never walks into one
         for root_path in self.file_roots:
-            if not os.path.exists(root_path):
+            root_path = os.path.abspath(root_path)
+            try:
+                stat = os.stat(root_path)
+            except OSError:
                 continue
             
-            try:
-                for root, dirs, filenames in os.walk(root_path):
-                    depth = root.replace(root_path, '').count(os.sep)
-                    if depth >= max_depth:
-                        dirs[:] = []
+            key = (stat.st_dev, stat.st_ino)
+            if key not in visited and max_depth > 0:
+                visited.add(key)
+                roots.append((root_path, stat.st_mtime))
+        
+        with ThreadPoolExecutor(max_workers=self.walk_workers) as pool:
+            # One queue of (future, dirpath, depth, mtime) per root; the pool
+            # works ahead while results are taken from the front
+            queues = []
+            for root_path, mtime in roots:
+                future = pool.submit(self.scan_directory, root_path, max_depth > 1)
+                queues.append((root_path, deque([(future, root_path, 0, mtime)])))
+            
+            for root_path, queue in queues:
+                while queue:
+                    future, dirpath, depth, mtime = queue.popleft()
+                    try:
+                        dir_files, subdirs = future.result()
+                    except OSError as e:
+                        if dirpath == root_path:
+                            print(f"Error indexing files in {root_path}: {e}")
                         continue
                     
-                    dirs[:] = [d for d in dirs if not d.startswith('.')]
+                    if dir_mtimes is not None:
+                        dir_mtimes[dirpath] = mtime
                     
-                    for filename in filenames:
-                        if filename.startswith('.'):
-                            continue
-                        
-                        filepath = os.path.join(root, filename)
-                        
-                        try:
-                            stat = os.stat(filepath)
-                            files.append({
-                                'type': 'file',
-                                'name': filename,
-                                'path': filepath,
-                                'mtime': stat.st_mtime,
-                                'size': stat.st_size
-                            })
-                            
-                            file_count += 1
-                            if file_count >= max_files:
-                                return files
-                        except Exception:
+                    for name, file_mtime, size in dir_files:
+                        files.add(dirpath, name, file_mtime, size)
+                    
+                    if len(files) >= max_files:
+                        for _, queued in queues:
+                            for entry in queued:
+                                entry[0].cancel()
+                        files.truncate(max_files)
+                        return files
+                    
+                    for subdir, key, sub_mtime in subdirs:
+                        if key in visited:
                             continue
-            except Exception as e:
-                print(f"Error indexing files in {root_path}: {e}")
+                        visited.add(key)
+                        future = pool.submit(self.scan_directory, subdir, depth + 2 < max_depth)
+                        queue.append((future, subdir, depth + 1, sub_mtime))
         
         return files
     
@@ -231,16 +561,29 @@ class Indexer:
         print("Starting full index...")
         
         try:
-            self.apps_data = self.index_applications()
-            print(f"Indexed {len(self.apps_data)} applications")
+            print(f"Indexed {self.refresh_applications()} applications")
             
-            self.files_data = self.index_files()
-            print(f"Indexed {len(self.files_data)} files")
+            if self.files_data and not self.detect_drift():
+                print(f"File index is up to date ({len(self.files_data)} files)")
+            else:
+                dir_mtimes = {}
+                files = self.index_files(dir_mtimes=dir_mtimes)
+                files_index = self.build_name_index(files.names)
+                with self.lock:
+                    self.files_data, self.files_index = files, files_index
+                    self.dir_mtimes = dir_mtimes
+                    self.indexed_max_files = self.max_files
+                    self.files_truncated = len(files) >= self.max_files
+                    self.generation += 1
+                print(f"Indexed {len(self.files_data)} files")
             
             self.save_caches()
             print("Index complete and saved")
         finally:
             self.indexing = False
+        
+        if self.watch:
+            self.start_watching()
     
     def index_all_async(self):
         """Run indexing in background thread."""
@@ -252,27 +595,318 @@ class Indexer:
         """Get all indexed applications."""
         return self.apps_data
     
-    def get_files(self) -> List[Dict[str, Any]]:
+    def get_files(self) -> FileTable:
         """Get all indexed files."""
         return self.files_data
     
-    def record_usage(self, item_id: str):
-        """Record usage of an item for ranking."""
-        if item_id not in self.usage_data:
-            self.usage_data[item_id] = {
-                'count': 0,
-                'last_used': 0
-            }
+    def get_name_index(self, kind: str) -> NameIndex:
+        """Get the name index for 'app' or 'file' items."""
+        return self.apps_index if kind == 'app' else self.files_index
+    
+    def get_field_keys(self, kind: str) -> Optional[FieldKeys]:
+        """Get the token, acronym and keyword match keys; only apps have them."""
+        return self.apps_keys if kind == 'app' else None
+
+    def position_of(self, kind: str, item_id: str) -> Optional[int]:
+        """Get the position of an 'app' or 'file' item by its path."""
+        if kind == 'file':
+            return self.files_data.position_of(item_id)
+        
+        if self._app_positions is None:
+            self._app_positions = {}
+            for idx, app in enumerate(self.apps_data):
+                self._app_positions.setdefault(app.get('path', app.get('name', '')), idx)
+        return self._app_positions.get(item_id)
+    
+    # --------------------------
+    # Incremental file updates
+    # --------------------------
+    
+    def detect_drift(self) -> bool:
+        """
+        Check whether any indexed directory changed since it was last recorded,
+        or the file cap changed in a way that changes which files are kept.
+        """
+        if not self.dir_mtimes:
+            return True
+        
+        # A walk that stopped at the cap never recorded the directories it
+        # skipped, so a higher cap has to walk again to find their files
+        if self.indexed_max_files != self.max_files:
+            if self.indexed_max_files is None or self.files_truncated or len(self.files_data) > self.max_files:
+                return True
+        
+        for dirpath, mtime in self.dir_mtimes.items():
+            try:
+                if os.stat(dirpath).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        
+        return False
+    
+    def start_watching(self) -> bool:
+        """Start applying filesystem events to the file index and application list."""
+        if self.watcher is None:
+            # watchdog is only imported once indexing is done
+            from .watcher import FileWatcher
+            self.watcher = FileWatcher(self)
+        return self.watcher.start()
+    
+    def close(self):
+        """Stop watching and release open cache files."""
+        if self.watcher is not None:
+            self.watcher.stop()
+        with self.lock:
+            if self._apps_refresh is not None:
+                self._apps_refresh.cancel()
+                self._apps_refresh = None
+            self.close_journal()
+        self.usage.close()
+    
+    def is_indexed_dir(self, dirpath: str) -> bool:
+        """Check whether index_files would index the files directly in dirpath."""
+        for root_path in self.file_roots:
+            rel = os.path.relpath(dirpath, root_path)
+            if rel == '.':
+                return True
+            if rel == '..' or rel.startswith('..' + os.sep):
+                continue
+            
+            parts = rel.split(os.sep)
+            if len(parts) < self.max_depth and not any(part.startswith('.') for part in parts):
+                return True
+        
+        return False
+    
+    def add_path(self, path: str, is_directory: bool = False):
+        """Apply a created or modified path to the file index."""
+        if not self._tracks(path):
+            return
+        
+        # A new tree is walked before the lock is taken, so searches keep
+        # running meanwhile
+        dirs, items = self._scan_path(path, is_directory)
+        with self.lock:
+            self._apply_scan(dirs, items)
+    
+    def remove_path(self, path: str, is_directory: bool = False):
+        """Apply a deleted path to the file index."""
+        dirpath = os.path.dirname(path)
+        if os.path.basename(path).startswith('.') or not self.is_indexed_dir(dirpath):
+            return
+        
+        with self.lock:
+            changes = self._changes
+            if is_directory:
+                self._remove_tree(path)
+            elif self._drop_file(path):
+                self._journal_write({'op': 'remove', 'path': path})
+            self._touch_dir(dirpath)
+            
+            if self._changes != changes:
+                self.generation += 1
+    
+    def move_path(self, src_path: str, dest_path: str, is_directory: bool = False):
+        """Apply a moved path to the file index."""
+        scan = self._scan_path(dest_path, is_directory) if self._tracks(dest_path) else None
+        with self.lock:
+            self.remove_path(src_path, is_directory)
+            if scan is not None:
+                self._apply_scan(*scan)
+    
+    def touch_dir(self, dirpath: str):
+        """Record the current mtime of a directory after its entries changed."""
+        with self.lock:
+            self._touch_dir(dirpath)
+    
+    def _tracks(self, path: str) -> bool:
+        """Whether changes to path can affect the file index."""
+        return not os.path.basename(path).startswith('.') and self.is_indexed_dir(os.path.dirname(path))
+    
+    def _scan_path(self, path: str, is_directory: bool) -> tuple:
+        """
+        Stat a created path, walking it if it is a directory, without the lock.
+        Returns (dirpath, mtime or None) for every indexed directory involved,
+        its parent included, and the file items found.
+        """
+        dirs = []
+        items = []
+        
+        if is_directory:
+            for root, subdirs, filenames in os.walk(path):
+                if not self.is_indexed_dir(root):
+                    subdirs[:] = []
+                    continue
+                
+                subdirs[:] = [d for d in subdirs if not d.startswith('.')]
+                dirs.append((root, self._dir_mtime(root)))
+                for filename in filenames:
+                    if not filename.startswith('.'):
+                        item = self._stat_file(os.path.join(root, filename))
+                        if item is not None:
+                            items.append(item)
+        else:
+            item = self._stat_file(path)
+            if item is not None:
+                items.append(item)
         
-        self.usage_data[item_id]['count'] += 1
-        self.usage_data[item_id]['last_used'] = time.time()
+        parent = os.path.dirname(path)
+        dirs.append((parent, self._dir_mtime(parent)))
+        return dirs, items
+    
+    def _apply_scan(self, dirs: List[tuple], items: List[Dict[str, Any]]):
+        """Apply the result of _scan_path; called with the lock held."""
+        changes = self._changes
+        for item in items:
+            self._add_item(item)
+        for dirpath, mtime in dirs:
+            self._record_dir(dirpath, mtime)
         
+        # Rankings and search sessions only need to start over on a real change
+        if self._changes != changes:
+            self.generation += 1
+    
+    def _stat_file(self, filepath: str) -> Optional[Dict[str, Any]]:
         try:
-            with open(self.usage_cache_file, 'w') as f:
-                json.dump(self.usage_data, f, indent=2)
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        
+        return {
+            'type': 'file',
+            'name': os.path.basename(filepath),
+            'path': filepath,
+            'mtime': stat.st_mtime,
+            'size': stat.st_size
+        }
+    
+    def _dir_mtime(self, dirpath: str) -> Optional[float]:
+        try:
+            return os.stat(dirpath).st_mtime
+        except OSError:
+            return None
+    
+    def _add_item(self, item: Dict[str, Any]):
+        changes = self._changes
+        if self._put_file(item) and self._changes != changes:
+            self._journal_write({'op': 'add', 'item': item})
+    
+    def _remove_tree(self, dirpath: str):
+        changes = self._changes
+        self._forget_tree(dirpath)
+        if self._changes != changes:
+            self._journal_write({'op': 'rmdir', 'path': dirpath})
+    
+    def _forget_tree(self, dirpath: str):
+        prefix = dirpath + os.sep
+        
+        # Highest first, so swap-removal never moves a position still to be dropped
+        for idx in sorted(self.files_data.positions_under(dirpath), reverse=True):
+            self._drop_file_at(idx)
+        
+        for recorded in [d for d in self.dir_mtimes if d == dirpath or d.startswith(prefix)]:
+            del self.dir_mtimes[recorded]
+            self._changes += 1
+    
+    def _touch_dir(self, dirpath: str):
+        if self.is_indexed_dir(dirpath):
+            self._record_dir(dirpath, self._dir_mtime(dirpath))
+    
+    def _record_dir(self, dirpath: str, mtime: Optional[float]):
+        if mtime is None:
+            if self.dir_mtimes.pop(dirpath, None) is not None:
+                self._changes += 1
+                self._journal_write({'op': 'rmdir', 'path': dirpath})
+            return
+        
+        if self.dir_mtimes.get(dirpath) != mtime:
+            self.dir_mtimes[dirpath] = mtime
+            self._changes += 1
+            self._journal_write({'op': 'dir', 'path': dirpath, 'mtime': mtime})
+    
+    def _put_file(self, item: Dict[str, Any]) -> bool:
+        """Insert or update a file item; returns False when the index is full."""
+        idx = self.files_data.position_of(item['path'])
+        
+        if idx is not None:
+            if (self.files_data.mtimes[idx], self.files_data.sizes[idx]) != (item.get('mtime', 0.0), item.get('size', 0)):
+                self.files_data.update(idx, item)
+                self._changes += 1
+            return True
+        
+        if len(self.files_data) >= self.max_files:
+            self.files_truncated = True
+            return False
+        
+        self.files_data.append(item)
+        self.files_index.append(self.search_names([item['name']])[0])
+        self._changes += 1
+        return True
+    
+    def _drop_file(self, filepath: str) -> bool:
+        """Remove a file item by path."""
+        idx = self.files_data.position_of(filepath)
+        if idx is None:
+            return False
+        
+        self._drop_file_at(idx)
+        return True
+    
+    def _drop_file_at(self, idx: int):
+        # The last file moves into the freed slot in both the table and the index
+        self.files_data.swap_remove(idx)
+        self.files_index.swap_remove(idx)
+        self._changes += 1
+    
+    def _journal_write(self, entry: Dict[str, Any]):
+        try:
+            if self._journal is None:
+                self._journal = open(self.files_journal_file, 'a')
+            self._journal.write(json.dumps(entry) + '\n')
+            self._journal.flush()
         except Exception as e:
-            print(f"Error saving usage data: {e}")
+            print(f"Error writing file index journal: {e}")
+    
+    def close_journal(self):
+        """Close the file index journal if it is open."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def replay_journal(self):
+        """Apply file index deltas journaled since the last saved snapshot."""
+        if not self.files_journal_file.exists():
+            return
+        
+        with open(self.files_journal_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash; everything after it is lost
+                    break
+                
+                op = entry.get('op')
+                if op == 'add':
+                    self._put_file(entry['item'])
+                elif op == 'remove':
+                    self._drop_file(entry['path'])
+                elif op == 'dir':
+                    self.dir_mtimes[entry['path']] = entry['mtime']
+                elif op == 'rmdir':
+                    self._forget_tree(entry['path'])
+    
+    @property
+    def usage_version(self) -> int:
+        """Bumped on every recorded use so cached rankings can be dropped."""
+        return self.usage.version
+    
+    def record_usage(self, item_id: str):
+        """Record usage of an item for ranking; persisted in the background."""
+        with span('record_usage'):
+            self.frecency.record(item_id)
     
     def get_usage(self, item_id: str) -> Dict[str, Any]:
         """Get usage statistics for an item."""
-        return self.usage_data.get(item_id, {'count': 0, 'last_used': 0})
+        return self.usage.get(item_id)
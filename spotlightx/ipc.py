@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+IPC module for SpotlightX.
+Unix domain socket through which a client toggles or queries the running instance.
+"""
+
+import os
+import json
+import socket
+import threading
+from typing import Dict, Any, Callable, Iterable, Optional
+
+SOCKET_NAME = 'spotlightx.sock'
+
+# Requests and replies are single lines; anything longer is refused
+MAX_LINE = 1 << 20
+
+
+def socket_path() -> str:
+    """$SPOTLIGHTX_SOCKET, else spotlightx.sock in $XDG_RUNTIME_DIR, else a per-user path in /tmp."""
+    path = os.environ.get('SPOTLIGHTX_SOCKET')
+    if path:
+        return path
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.join('/tmp', f"spotlightx-{os.getuid()}.sock")
+
+
+def read_line(conn: socket.socket) -> bytes:
+    """Read up to the first newline or the end of the stream."""
+    data = b''
+    while b'\n' not in data:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+        if len(data) > MAX_LINE:
+            raise ValueError("line too long")
+    return data.split(b'\n', 1)[0]
+
+
+def parse_request(line: bytes) -> Dict[str, Any]:
+    """
+    A request is a JSON object with a 'command', or a plain
+    'command [query]' line so hotkeys can use `echo toggle | nc -U <socket>`.
+    """
+    text = line.decode('utf-8', errors='replace').strip()
+    if text.startswith('{'):
+        request = json.loads(text)
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        return request
+    
+    command, _, query = text.partition(' ')
+    return {'command': command, 'query': query}
+
+
+def send(command: str, path: Optional[str] = None, timeout: float = 5.0, **fields) -> Optional[Dict[str, Any]]:
+    """Send one request to the running instance. Returns its reply, or None if no instance is listening."""
+    request = dict(fields, command=command)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(path or socket_path())
+            conn.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            reply = read_line(conn)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except socket.timeout:
+        return {'ok': False, 'error': 'timed out'}
+    
+    if not reply:
+        return {'ok': False, 'error': 'no reply'}
+    return json.loads(reply)
+
+
+class IPCServer:
+    """
+    Answers one request per connection on the instance socket.
+    
+    Handlers map a command to a callable that takes the request and returns
+    a dict to merge into the reply. Each connection is read on its own
+    thread, so a slow client never holds up the accepting loop. Commands in
+    `background` are answered on that thread; once attached to a Tk app, the
+    rest are handed to its main loop with after(), so UI commands need no
+    locking.
+    """
+    
+    def __init__(self, handlers: Dict[str, Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]],
+                 background: Iterable[str] = (), path: Optional[str] = None):
+        self.handlers = dict(handlers)
+        self.handlers.setdefault('ping', lambda request: {'pid': os.getpid()})
+        self.background = set(background)
+        self.path = path or socket_path()
+        # Seconds a client gets to send its request line
+        self.request_timeout = 0.5
+        
+        self._server = None
+        self._root = None
+    
+    def listen(self) -> bool:
+        """Bind the socket. Returns False if another instance is already listening."""
+        if os.path.exists(self.path):
+            if send('ping', self.path, timeout=1.0) is not None:
+                return False
+            # Left behind by an instance that did not shut down cleanly
+            os.unlink(self.path)
+        
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self.path)
+        except OSError:
+            server.close()
+            return False
+        os.chmod(self.path, 0o600)
+        server.listen(16)
+        server.setblocking(False)
+        self._server = server
+        return True
+    
+    def attach(self, root):
+        """Accept connections on the Tk main loop."""
+        import tkinter
+        
+        self._root = root
+        root.tk.createfilehandler(self._server, tkinter.READABLE, lambda *_: self.accept())
+    
+    def serve_in_thread(self):
+        """Accept connections on a daemon thread, for instances without a Tk loop."""
+        server = self._server
+        server.setblocking(True)
+        
+        def accept_loop():
+            while self._server is server:
+                self.accept()
+        
+        threading.Thread(target=accept_loop, name='spotlightx-ipc', daemon=True).start()
+    
+    def accept(self):
+        """Accept one pending connection and answer it on a worker thread."""
+        server = self._server
+        if server is None:
+            return
+        try:
+            conn, _ = server.accept()
+        except OSError:
+            # Includes BlockingIOError when another handler got there first
+            return
+        
+        threading.Thread(target=self._handle, args=(conn,), name='spotlightx-ipc-conn', daemon=True).start()
+    
+    def _handle(self, conn: socket.socket):
+        try:
+            conn.settimeout(self.request_timeout)
+            request = parse_request(read_line(conn))
+        except Exception as e:
+            self._reply(conn, {'ok': False, 'error': f"bad request: {e}"})
+            return
+        
+        command = request.get('command', '')
+        handler = self.handlers.get(command)
+        if handler is None:
+            self._reply(conn, {'ok': False, 'error': f"unknown command: {command}"})
+            return
+        
+        root = self._root
+        if command in self.background or root is None:
+            self._answer(conn, handler, request)
+            return
+        
+        try:
+            root.after(0, self._answer, conn, handler, request)
+        except Exception as e:
+            # The main loop is gone, e.g. during shutdown
+            self._reply(conn, {'ok': False, 'error': str(e)})
+    
+    def _answer(self, conn: socket.socket, handler: Callable, request: Dict[str, Any]):
+        try:
+            reply = {'ok': True}
+            reply.update(handler(request) or {})
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+        self._reply(conn, reply)
+    
+    def _reply(self, conn: socket.socket, reply: Dict[str, Any]):
+        with conn:
+            try:
+                conn.settimeout(5.0)
+                conn.sendall(json.dumps(reply, default=str).encode('utf-8') + b'\n')
+            except OSError:
+                pass
+    
+    def close(self):
+        """Stop accepting and remove the socket."""
+        server = self._server
+        self._server = None
+        if server is None:
+            return
+        
+        if self._root is not None:
+            try:
+                self._root.tk.deletefilehandler(server)
+            except Exception:
+                pass
+            self._root = None
+        
+        server.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
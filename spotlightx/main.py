@@ -26,28 +26,51 @@
 Main entry point for SpotlightX — futuristic, fast Linux app launcher.
 """
 
+import os
 import sys
 import signal
+import argparse
+import threading
+from spotlightx import __version__
 from spotlightx.indexer import Indexer
 from spotlightx.search import SearchEngine
 from spotlightx.executor import Executor
+from spotlightx.headless import public_result
+from spotlightx.ipc import IPCServer, send
+from spotlightx.metrics import metrics, span
 from spotlightx.plugin_manager import PluginManager
 from spotlightx.ui import TkinterUI
 
 
+def env_int(name: str, default: int) -> int:
+    """Read a non-negative integer setting from the environment."""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        print(f"Error reading {name}: {value!r} is not a number")
+        return default
+
+
 class SpotlightX:
-    def __init__(self):
+    def __init__(self, daemon: bool = False):
         print("🚀 Initializing SpotlightX...")
+        self.daemon = daemon
         
-        self.indexer = Indexer()
-        self.search_engine = SearchEngine(self.indexer)
+        self.indexer = Indexer(watch=True)
+        self.indexer.max_files = env_int('SPOTLIGHTX_MAX_FILES', self.indexer.max_files)
+        # Sharding only pays off for indexes far past the default file cap,
+        # where one in-process search outgrows a round trip to the workers
+        self.search_engine = SearchEngine(self.indexer, shard_workers=env_int('SPOTLIGHTX_SEARCH_WORKERS', 0))
         self.executor = Executor()
         self.plugin_manager = PluginManager()
         
-        print("🔌 Loading plugins...")
-        self.plugin_manager.load_all_plugins()
-        self.plugin_manager.trigger_hook('on_startup')
-        
+        # Only plugin.json is read here; modules are imported once the
+        # window is up, or on first use for plugins that declare their hooks
+        self.plugin_manager.load_all_plugins(defer=True)
+
         print("📂 Starting initial indexing in background...")
         self.indexer.index_all_async()
         
@@ -57,49 +80,196 @@ class SpotlightX:
             on_select_callback=self.handle_select
         )
         
+        # Single instance: `python -m spotlightx.client toggle` reaches this one
+        self.ipc = IPCServer({
+            'toggle': self.handle_window_command,
+            'show': self.handle_window_command,
+            'hide': self.handle_window_command,
+            'query': self.handle_client_query,
+            'quit': self.handle_quit
+        }, background=('query',))
+        if self.ipc.listen():
+            self.ipc.attach(self.ui.root)
+        else:
+            print(f"Could not listen on {self.ipc.path}, client commands will not reach this instance")
+        
+        # Live span histograms for debugging: socat - UNIX-CONNECT:<path>
+        metrics_socket = os.environ.get('SPOTLIGHTX_METRICS_SOCKET')
+        if metrics_socket:
+            metrics.serve(metrics_socket)
+        
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
     
-    def handle_query(self, query: str):
-        """Handle search query."""
-        plugin_results = self.plugin_manager.trigger_hook('on_query', query)
+    def load_plugins(self):
+        """Import the plugins that could not be deferred to first use and run on_startup."""
+        print("🔌 Loading plugins...")
+        self.plugin_manager.load_pending_plugins()
+        self.plugin_manager.trigger_hook('on_startup')
+    
+    def handle_query(self, query: str, on_update=None):
+        """
+        Handle search query.
+        With on_update, results are also published as soon as each source has
+        them: quick and app results, then the index, then late plugin results.
+        """
+        if query.strip().lower().startswith('!perf'):
+            return self.perf_results(query.strip()[5:].strip().lower())
         
-        search_results = self.search_engine.search(query)
+        on_late = None
+        # The return value replaces every update published before it, so
+        # late results arriving until then are held back and returned
+        held = []
+        held_lock = threading.Lock()
+        if on_update is not None:
+            def on_late(plugin_result):
+                if not isinstance(plugin_result, list):
+                    return
+                with held_lock:
+                    if held is not None:
+                        held.append(plugin_result)
+                        return
+                on_update(plugin_result)
         
-        for plugin_result in plugin_results:
-            if isinstance(plugin_result, list):
-                search_results.extend(plugin_result)
+        with span('query'):
+            # Plugins run on their own workers while the index is searched
+            plugin_batch = self.plugin_manager.submit_query_hooks(query)
+            
+            with span('query.search'):
+                search_results = self.search_engine.search(query, on_partial=on_update)
+            if on_update is not None and plugin_batch:
+                # Index results do not wait for the plugins
+                on_update(list(search_results))
+            with span('query.plugins'):
+                plugin_results = self.plugin_manager.collect_query_hooks(plugin_batch, on_late=on_late)
+            
+            for plugin_result in plugin_results:
+                if isinstance(plugin_result, list):
+                    search_results.extend(plugin_result)
+            
+            with held_lock:
+                for plugin_result in held:
+                    search_results.extend(plugin_result)
+                held = None
         
         return search_results
     
-    def handle_select(self, item: dict):
-        """Handle item selection."""
-        self.plugin_manager.trigger_hook('on_open', item)
+    def perf_results(self, command: str):
+        """Results for the '!perf' debug keyword: span latencies and slow plugins."""
+        if command == 'reset':
+            metrics.reset()
+            return [self._info_result('Metrics reset', 'perf')]
+        
+        if command == 'dump':
+            path = str(self.indexer.cache_dir / 'metrics.json')
+            if metrics.dump(path, {'plugin_hooks': self.plugin_manager.get_hook_stats()}):
+                return [self._info_result(f"Metrics written to {path}", 'perf')]
+            return [self._info_result('Could not write metrics', 'perf')]
+        
+        results = [self._info_result(line, 'span') for line in metrics.format_lines()]
+        for stats in self.plugin_manager.get_hook_stats():
+            status = ', disabled' if stats['disabled'] else ''
+            results.append(self._info_result(
+                f"plugin {stats['plugin']} {stats['hook']}: avg {stats['avg_ms']:.2f} ms, "
+                f"max {stats['max_ms']:.2f} ms, {stats['timeouts']} timeouts{status}",
+                'plugin'
+            ))
         
-        success = self.executor.execute(item)
+        if not results:
+            results.append(self._info_result('No timings recorded yet', 'perf'))
         
-        if success:
-            item_id = item.get('path', item.get('name', ''))
-            self.indexer.record_usage(item_id)
+        # Keep the list in the order built above
+        for rank, result in enumerate(results):
+            result['score'] = 1000 - rank
+        return results
     
-    def signal_handler(self, sig, frame):
-        """Handle shutdown signals."""
+    def _info_result(self, name: str, subtitle: str):
+        return {
+            'type': 'info',
+            'name': name,
+            'subtitle': subtitle,
+            'action': '',
+            'icon': 'perf',
+            'score': 1000
+        }
+    
+    def handle_window_command(self, request: dict):
+        """Show, hide or toggle the window for a client; runs on the Tk main loop."""
+        getattr(self.ui, request['command'])()
+        return {'visible': self.ui.visible}
+    
+    def handle_client_query(self, request: dict):
+        """Answer a client query without touching the window."""
+        limit = int(request.get('limit', 12))
+        results = self.handle_query(str(request.get('query', '')))
+        return {
+            'results': [public_result(result) for result in results[:limit]]
+        }
+    
+    def handle_quit(self, request: dict):
+        """Shut down after the reply has been sent."""
+        self.ui.root.after(50, self.quit)
+    
+    def handle_select(self, item: dict):
+        """Handle item selection."""
+        with span('select'):
+            self.plugin_manager.trigger_hook('on_open', item)
+            
+            success = self.executor.execute(item)
+            
+            if success:
+                item_id = item.get('path', item.get('name', ''))
+                self.indexer.record_usage(item_id)
+    
+    def shutdown(self):
+        """Release plugins, workers, sockets and the index."""
         print("\n🛑 Shutting down SpotlightX...")
+        self.ipc.close()
         self.plugin_manager.trigger_hook('on_shutdown')
+        self.plugin_manager.shutdown()
+        self.search_engine.close()
+        self.indexer.close()
+        metrics.stop_serving()
+    
+    def quit(self):
+        """Shut down and leave the Tk main loop."""
+        self.shutdown()
+        self.ui.root.quit()
+    
+    def signal_handler(self, sig, frame):
+        """Handle shutdown signals."""
+        self.shutdown()
         sys.exit(0)
     
-    def run(self):
+    def run(self, show: bool = True):
         """Run the application."""
         print("✅ SpotlightX is ready!")
-        print("👉 Press Ctrl+C to quit, or use the search window directly")
-        self.ui.show()     # <<< langsung tampil
+        if self.daemon:
+            print("👉 Running in the background, toggle with: python -m spotlightx.client toggle")
+        else:
+            print("👉 Press Ctrl+C to quit, or use the search window directly")
+        if show:
+            self.ui.show()     # <<< langsung tampil
+        threading.Thread(target=self.load_plugins, name='spotlightx-plugins', daemon=True).start()
         self.ui.run()
 
 
 def main():
     """Main entry point."""
-    app = SpotlightX()
-    app.run()
+    parser = argparse.ArgumentParser(prog='spotlightx')
+    parser.add_argument('--daemon', action='store_true',
+                        help='stay resident with the window hidden; toggle it with `python -m spotlightx.client toggle`')
+    parser.add_argument('--show', action='store_true', help='with --daemon, show the window right away')
+    parser.add_argument('--version', action='version', version=f"SpotlightX {__version__}")
+    args = parser.parse_args()
+    
+    # The running instance keeps the index warm; a second launch just shows it
+    if send('ping' if args.daemon else 'show', timeout=1.0) is not None:
+        print("SpotlightX is already running")
+        return
+    
+    app = SpotlightX(daemon=args.daemon)
+    app.run(show=not args.daemon or args.show)
 
 
 if __name__ == '__main__':
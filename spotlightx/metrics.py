@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Metrics module for SpotlightX.
+Timing spans aggregated into rolling latency histograms.
+"""
+
+import os
+import json
+import time
+import socket
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+
+class RollingHistogram:
+    """Latency samples of one span; keeps the most recent `size` of them."""
+    
+    def __init__(self, size: int = 512):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, elapsed_ms: float):
+        self.samples.append(elapsed_ms)
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Percentiles over the recent window, totals over all samples."""
+        ordered = sorted(self.samples)
+        
+        def pick(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+        
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'p50_ms': pick(50),
+            'p95_ms': pick(95),
+            'p99_ms': pick(99),
+            'max_ms': self.max_ms,
+            'last_ms': self.samples[-1] if self.samples else 0.0
+        }
+
+
+class Metrics:
+    """Registry of named spans, safe to record into from any thread."""
+    
+    def __init__(self, window: int = 512):
+        self.window = window
+        self.enabled = True
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def record(self, name: str, elapsed_ms: float):
+        """Add one sample to a span's histogram."""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+            histogram.add(elapsed_ms)
+    
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as one sample of `name`."""
+        if not self.enabled:
+            yield
+            return
+        
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Summaries of every span, keyed by span name."""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+    
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+    
+    def format_lines(self) -> List[str]:
+        """One line per span, slowest p95 first."""
+        snapshot = self.snapshot()
+        lines = []
+        for name, summary in sorted(snapshot.items(), key=lambda x: x[1]['p95_ms'], reverse=True):
+            lines.append(
+                f"{name}: p50 {summary['p50_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, "
+                f"max {summary['max_ms']:.2f} ms ({summary['count']} calls)"
+            )
+        return lines
+    
+    def dump(self, path: str, extra: Optional[Dict[str, Any]] = None) -> bool:
+        """Write the snapshot (plus extra sections) as JSON."""
+        report = {'timestamp': time.time(), 'spans': self.snapshot()}
+        if extra:
+            report.update(extra)
+        
+        try:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(report, f, indent=2)
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            print(f"Error writing metrics: {e}")
+            return False
+    
+    def serve(self, path: str):
+        """
+        Answer every connection on a Unix socket with the JSON snapshot,
+        e.g. `socat - UNIX-CONNECT:<path>`.
+        """
+        try:
+            if os.path.exists(path):
+                os.unlink(path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            os.chmod(path, 0o600)
+            server.listen(4)
+        except Exception as e:
+            print(f"Error starting metrics socket: {e}")
+            return
+        
+        self._server = server
+        
+        def accept_loop():
+            while self._server is server:
+                try:
+                    conn, _ = server.accept()
+                except OSError:
+                    break
+                with conn:
+                    try:
+                        conn.sendall(json.dumps({'spans': self.snapshot()}).encode('utf-8') + b'\n')
+                    except OSError:
+                        pass
+        
+        threading.Thread(target=accept_loop, name='spotlightx-metrics', daemon=True).start()
+    
+    def stop_serving(self):
+        server = self._server
+        self._server = None
+        if server is not None:
+            try:
+                path = server.getsockname()
+                server.close()
+                os.unlink(path)
+            except Exception:
+                pass
+
+
+# Shared by every module so spans from search, plugins and UI end up together
+metrics = Metrics()
+span = metrics.span
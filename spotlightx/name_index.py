@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Name index module for SpotlightX.
+Inverted trigram and prefix index used to narrow fuzzy search candidates.
+"""
+
+import pickle
+import re
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+
+INDEX_VERSION = 4
+
+_TOKEN_SPLIT = re.compile(r'[^0-9a-z]+')
+
+
+class NameIndex:
+    """
+    Maps trigrams and short prefixes of item names to item positions.
+
+    Keeps the indexed names in `names`, aligned with the item list the index
+    was built for. Names must already be normalized. A query matches names
+    that start with its prefix (or have a word that does) and, from three
+    characters on, names sharing one of its trigrams. Names too short to have
+    a trigram are always candidates.
+    """
+
+    def __init__(self, prefix_length: int = 2):
+        self.prefix_length = prefix_length
+        self.names: List[str] = []
+        self.trigrams: Dict[str, array] = {}
+        self.prefixes: Dict[str, array] = {}
+        self.short: Set[int] = set()
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def trigrams_of(name: str) -> Set[str]:
+        """Return the distinct trigrams of a name."""
+        return {name[i:i + 3] for i in range(len(name) - 2)}
+
+    def prefixes_of(self, name: str) -> Set[str]:
+        """Return the prefixes of a name and of each word in it."""
+        prefixes = set()
+        words = [name] + [word for word in _TOKEN_SPLIT.split(name) if word]
+        for word in words:
+            for length in range(1, min(self.prefix_length, len(word)) + 1):
+                prefixes.add(word[:length])
+        return prefixes
+
+    def _post(self, idx: int, name: str):
+        for gram in self.trigrams_of(name):
+            postings = self.trigrams.get(gram)
+            if postings is None:
+                postings = self.trigrams[gram] = array('I')
+            postings.append(idx)
+
+        for prefix in self.prefixes_of(name):
+            postings = self.prefixes.get(prefix)
+            if postings is None:
+                postings = self.prefixes[prefix] = array('I')
+            postings.append(idx)
+
+        if len(name) < 3:
+            self.short.add(idx)
+
+    def _unpost(self, idx: int, name: str):
+        for table, keys in ((self.trigrams, self.trigrams_of(name)),
+                            (self.prefixes, self.prefixes_of(name))):
+            for key in keys:
+                postings = table.get(key)
+                if postings is None:
+                    continue
+                try:
+                    postings.remove(idx)
+                except ValueError:
+                    continue
+                if not postings:
+                    del table[key]
+
+        self.short.discard(idx)
+
+    def append(self, name: str) -> int:
+        """Index a name at the next position and return that position."""
+        idx = len(self.names)
+        self.names.append(name)
+        self._post(idx, name)
+        return idx
+
+    def replace(self, idx: int, name: str):
+        """Re-index position idx under a new name."""
+        self._unpost(idx, self.names[idx])
+        self.names[idx] = name
+        self._post(idx, name)
+
+    def swap_remove(self, idx: int):
+        """
+        Drop position idx by moving the last name into its place,
+        mirroring list.pop() after a swap in the indexed item list.
+        """
+        last = len(self.names) - 1
+        self._unpost(idx, self.names[idx])
+        if idx != last:
+            moved = self.names[last]
+            self._unpost(last, moved)
+            self.names[idx] = moved
+            self._post(idx, moved)
+        self.names.pop()
+
+    @classmethod
+    def build(cls, names: Iterable[str], prefix_length: int = 2) -> 'NameIndex':
+        """Build an index over names, keyed by their position."""
+        index = cls(prefix_length)
+        for name in names:
+            index.append(name)
+        return index
+
+    def candidates(self, query: str) -> List[int]:
+        """Return the sorted positions of names sharing a prefix or trigram with the query."""
+        lookups = [(self.prefixes, query[:self.prefix_length])]
+        if len(query) >= 3:
+            lookups.extend((self.trigrams, gram) for gram in self.trigrams_of(query))
+
+        found = set(self.short)
+        for table, key in lookups:
+            postings = table.get(key)
+            if postings is not None:
+                found.update(postings)
+
+        return sorted(found)
+
+    def added_candidates(self, previous: str, query: str) -> Set[int]:
+        """
+        Return the positions candidates(query) may have beyond
+        candidates(previous), for a query that extends previous.
+        """
+        found = set()
+        if query[:self.prefix_length] != previous[:self.prefix_length]:
+            found.update(self.prefixes.get(query[:self.prefix_length], ()))
+        for gram in self.trigrams_of(query) - self.trigrams_of(previous):
+            found.update(self.trigrams.get(gram, ()))
+        return found
+
+    def save(self, path: Path, fingerprint: tuple):
+        """
+        Persist the index, tagged with the fingerprint of the data it covers.
+        Names are not saved; they are passed back in on load.
+        """
+        state = {
+            'version': INDEX_VERSION,
+            'fingerprint': fingerprint,
+            'prefix_length': self.prefix_length,
+            'trigrams': self.trigrams,
+            'prefixes': self.prefixes,
+            'short': self.short
+        }
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: tuple, names: List[str]) -> Optional['NameIndex']:
+        """Load a persisted index for names, or None if it is missing or stale."""
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+        if state.get('version') != INDEX_VERSION or state.get('fingerprint') != fingerprint:
+            return None
+        if len(names) != fingerprint[0]:
+            return None
+
+        index = cls(state['prefix_length'])
+        index.names = names
+        index.trigrams = state['trigrams']
+        index.prefixes = state['prefixes']
+        index.short = state['short']
+        return index
@@ -29,9 +29,14 @@ Handles plugin loading, registration, and hook execution.
 
 import os
 import json
+import time
+import threading
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from .metrics import span
 
 
 class PluginManager:
@@ -50,9 +55,40 @@ class PluginManager:
             'on_startup': [],
             'on_shutdown': []
         }
+        
+        # on_query hooks run concurrently, each within its own time budget
+        self.query_timeout_ms = 150
+        self.max_consecutive_timeouts = 5
+        self.query_workers = 4
+        self.hook_stats = {}
+        self._stats_lock = threading.Lock()
+        self._query_pool = None
+        self._loading_plugin = None
+        
+        # on_query hooks that declared triggers, looked up per keystroke:
+        # prefix length -> prefix -> callbacks, and keyword -> callbacks.
+        # Deferred plugins register while queries run, so the on_query list
+        # and these tables are only used under _hooks_lock
+        self.query_triggers = {}
+        self._prefix_table = {}
+        self._keyword_table = {}
+        self._hooks_lock = threading.RLock()
+        
+        # Deferred loading: stand-in hooks per plugin until its module is
+        # imported, the hooks each plugin registered, and plugins left to
+        # import once the window is up
+        self._stubs = {}
+        self._plugin_hooks = {}
+        self._pending = []
+        self._load_lock = threading.RLock()
     
-    def load_plugin(self, plugin_path: Path) -> Optional[Dict[str, Any]]:
-        """Load a single plugin from directory."""
+    def load_plugin(self, plugin_path: Path, defer: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Load a single plugin from directory.
+        With defer, nothing is imported yet. A plugin whose plugin.json lists
+        its "hooks" (other than on_startup) gets stand-in hooks that import it
+        on first use; any other plugin waits for load_pending_plugins().
+        """
         metadata_file = plugin_path / "plugin.json"
         plugin_file = plugin_path / "plugin.py"
         
@@ -62,59 +98,406 @@ class PluginManager:
         try:
             with open(metadata_file, 'r') as f:
                 metadata = json.load(f)
-            
-            plugin_id = metadata.get('id', plugin_path.name)
-            
-            if not metadata.get('enabled', False):
-                print(f"Plugin {plugin_id} is disabled, skipping")
-                return None
-            
-            spec = importlib.util.spec_from_file_location(plugin_id, plugin_file)
-            if spec and spec.loader:
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                if hasattr(module, 'register'):
-                    module.register(self)
-                
-                plugin_data = {
-                    'id': plugin_id,
-                    'name': metadata.get('name', plugin_id),
-                    'version': metadata.get('version', '1.0.0'),
-                    'description': metadata.get('description', ''),
-                    'module': module,
-                    'metadata': metadata
-                }
-                
-                self.plugins[plugin_id] = plugin_data
-                print(f"Loaded plugin: {plugin_id}")
-                return plugin_data
         except Exception as e:
             print(f"Error loading plugin from {plugin_path}: {e}")
             return None
+        
+        plugin_id = metadata.get('id', plugin_path.name)
+        
+        if not metadata.get('enabled', False):
+            print(f"Plugin {plugin_id} is disabled, skipping")
+            return None
+        
+        plugin_data = {
+            'id': plugin_id,
+            'name': metadata.get('name', plugin_id),
+            'version': metadata.get('version', '1.0.0'),
+            'description': metadata.get('description', ''),
+            'module': None,
+            'metadata': metadata,
+            'path': plugin_file,
+            'import_ms': None
+        }
+        self.plugins[plugin_id] = plugin_data
+        
+        if defer:
+            hooks = metadata.get('hooks')
+            if hooks and 'on_startup' not in hooks and all(hook in self.hooks for hook in hooks):
+                self._install_stubs(plugin_data, hooks)
+            else:
+                self._pending.append(plugin_id)
+            return plugin_data
+        
+        if not self._import_plugin(plugin_data):
+            return None
+        return plugin_data
     
-    def load_all_plugins(self):
+    def load_all_plugins(self, defer: bool = False):
         """Load all plugins from plugins directory."""
         if not self.plugins_dir.exists():
             return
         
         for item in self.plugins_dir.iterdir():
             if item.is_dir():
-                self.load_plugin(item)
+                self.load_plugin(item, defer)
     
-    def register_hook(self, hook_name: str, callback: Callable):
-        """Register a callback for a hook."""
-        if hook_name in self.hooks:
-            self.hooks[hook_name].append(callback)
-        else:
+    def load_pending_plugins(self) -> int:
+        """Import the deferred plugins that have no stand-in hooks; returns how many loaded."""
+        loaded = 0
+        while self._pending:
+            plugin_id = self._pending.pop(0)
+            with self._load_lock:
+                plugin_data = self.plugins.get(plugin_id)
+                if plugin_data is not None and plugin_data['module'] is None and self._import_plugin(plugin_data):
+                    loaded += 1
+        return loaded
+    
+    def ensure_plugin_loaded(self, plugin_id: str) -> Dict[str, List[Callable]]:
+        """Import a deferred plugin if needed; returns the hooks it registered by hook name."""
+        with self._load_lock:
+            plugin_data = self.plugins.get(plugin_id)
+            if plugin_data is not None and plugin_data['module'] is None:
+                self._remove_stubs(plugin_id)
+                self._import_plugin(plugin_data)
+            
+            hooks = {}
+            for hook_name, callback in self._plugin_hooks.get(plugin_id, ()):
+                hooks.setdefault(hook_name, []).append(callback)
+            return hooks
+    
+    def _import_plugin(self, plugin_data: Dict[str, Any]) -> bool:
+        """Execute a plugin module and its register(); the import time is kept per plugin."""
+        plugin_id = plugin_data['id']
+        start = time.perf_counter()
+        try:
+            with span(f"plugin.import.{plugin_id}"):
+                spec = importlib.util.spec_from_file_location(plugin_id, plugin_data['path'])
+                if not spec or not spec.loader:
+                    raise ImportError(f"cannot import {plugin_data['path']}")
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                
+                if hasattr(module, 'register'):
+                    # Hooks registered now are attributed to this plugin
+                    self._loading_plugin = (plugin_id, plugin_data['metadata'])
+                    try:
+                        module.register(self)
+                    finally:
+                        self._loading_plugin = None
+        except Exception as e:
+            print(f"Error loading plugin {plugin_id}: {e}")
+            self.plugins.pop(plugin_id, None)
+            return False
+        
+        plugin_data['module'] = module
+        plugin_data['import_ms'] = (time.perf_counter() - start) * 1000
+        print(f"Loaded plugin: {plugin_id} ({plugin_data['import_ms']:.1f} ms)")
+        return True
+    
+    def _install_stubs(self, plugin_data: Dict[str, Any], hooks: List[str]):
+        """Register stand-ins for the hooks a deferred plugin declares."""
+        plugin_id = plugin_data['id']
+        stubs = []
+        # Stand-in on_query hooks take the plugin's triggers and time budget
+        self._loading_plugin = (plugin_id, plugin_data['metadata'])
+        try:
+            for hook_name in hooks:
+                stub = self._make_stub(plugin_id, hook_name)
+                self.register_hook(hook_name, stub)
+                stubs.append((hook_name, stub))
+        finally:
+            self._loading_plugin = None
+        self._plugin_hooks.pop(plugin_id, None)
+        self._stubs[plugin_id] = stubs
+    
+    def _make_stub(self, plugin_id: str, hook_name: str) -> Callable:
+        def stub(*args, **kwargs):
+            results = []
+            for callback in self.ensure_plugin_loaded(plugin_id).get(hook_name, ()):
+                result = callback(*args, **kwargs)
+                if isinstance(result, list):
+                    results.extend(result)
+            return results if hook_name == 'on_query' else None
+        
+        stub.__qualname__ = f"{plugin_id}.{hook_name} (deferred)"
+        return stub
+    
+    def _remove_stubs(self, plugin_id: str):
+        for hook_name, stub in self._stubs.pop(plugin_id, ()):
+            self.unregister_hook(hook_name, stub)
+            # Stand-ins that were ever submitted keep their stats, which
+            # include the import; a call may still be on its way to a worker
+            with self._stats_lock:
+                stats = self.hook_stats.get(stub)
+                if stats is not None and not stats['submitted']:
+                    del self.hook_stats[stub]
+    
+    def register_hook(self, hook_name: str, callback: Callable,
+                      timeout_ms: Optional[float] = None,
+                      prefixes: Optional[List[str]] = None,
+                      keywords: Optional[List[str]] = None):
+        """
+        Register a callback for a hook.
+        on_query callbacks get a time budget: timeout_ms, else the plugin's
+        "query_timeout_ms" from plugin.json, else query_timeout_ms.
+        They are only called for queries starting with one of prefixes or
+        equal to one of keywords (else the plugin's "triggers" from
+        plugin.json); callbacks without triggers see every query.
+        """
+        if hook_name not in self.hooks:
             print(f"Unknown hook: {hook_name}")
+            return
+        
+        with self._hooks_lock:
+            self.hooks[hook_name].append(callback)
+            if self._loading_plugin is not None:
+                self._plugin_hooks.setdefault(self._loading_plugin[0], []).append((hook_name, callback))
+            
+            if hook_name == 'on_query':
+                plugin_id, metadata = self._loading_plugin or (None, {})
+                if timeout_ms is None:
+                    timeout_ms = metadata.get('query_timeout_ms')
+                self._track_query_hook(callback, plugin_id, timeout_ms)
+                
+                # Queries never see the callback without its triggers
+                if prefixes is None and keywords is None:
+                    triggers = metadata.get('triggers', {})
+                    prefixes = triggers.get('prefixes')
+                    keywords = triggers.get('keywords')
+                if prefixes or keywords:
+                    self.add_query_triggers(callback, prefixes or [], keywords or [])
+    
+    def unregister_hook(self, hook_name: str, callback: Callable):
+        """Remove a callback from a hook, along with its query triggers."""
+        if hook_name not in self.hooks:
+            return
+        
+        with self._hooks_lock:
+            # Replaced rather than mutated, so a hook run in progress is not disturbed
+            self.hooks[hook_name] = [registered for registered in self.hooks[hook_name] if registered != callback]
+            
+            if hook_name == 'on_query' and callback in self.query_triggers:
+                prefixes, keywords = self.query_triggers.pop(callback)
+                for prefix in prefixes:
+                    table = self._prefix_table.get(len(prefix), {})
+                    table[prefix] = [registered for registered in table.get(prefix, ()) if registered != callback]
+                for keyword in keywords:
+                    self._keyword_table[keyword] = [
+                        registered for registered in self._keyword_table.get(keyword, ()) if registered != callback
+                    ]
+    
+    def add_query_triggers(self, callback: Callable, prefixes: List[str], keywords: List[str]):
+        """Restrict an on_query callback to queries matching its triggers."""
+        prefixes = [prefix.lower() for prefix in prefixes if prefix]
+        keywords = [keyword.lower() for keyword in keywords if keyword]
+        
+        with self._hooks_lock:
+            self.query_triggers[callback] = (prefixes, keywords)
+            for prefix in prefixes:
+                table = self._prefix_table.setdefault(len(prefix), {})
+                table.setdefault(prefix, []).append(callback)
+            for keyword in keywords:
+                self._keyword_table.setdefault(keyword, []).append(callback)
+    
+    def query_hooks_for(self, query: str) -> List[Callable]:
+        """on_query callbacks to call for a query, in registration order."""
+        query_lower = query.lower()
+        
+        with self._hooks_lock:
+            matched = set(self._keyword_table.get(query_lower, ()))
+            for length, table in self._prefix_table.items():
+                if len(query_lower) >= length:
+                    matched.update(table.get(query_lower[:length], ()))
+            
+            return [
+                callback for callback in self.hooks['on_query']
+                if callback in matched or callback not in self.query_triggers
+            ]
+    
+    def _track_query_hook(self, callback: Callable, plugin_id: Optional[str] = None,
+                          timeout_ms: Optional[float] = None) -> Dict[str, Any]:
+        """Create the latency and timeout counters of an on_query hook."""
+        stats = {
+            'plugin': plugin_id,
+            'hook': getattr(callback, '__qualname__', repr(callback)),
+            'timeout_ms': timeout_ms,
+            'submitted': 0,
+            'calls': 0,
+            'timeouts': 0,
+            'consecutive_timeouts': 0,
+            'errors': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'last_ms': 0.0,
+            'disabled': False,
+            # The latest call, its deadline, and the last call counted as
+            # a timeout, so an overrunning call is counted only once
+            'running': None,
+            'deadline': 0.0,
+            'timed_out': None
+        }
+        with self._stats_lock:
+            self.hook_stats[callback] = stats
+        return stats
+    
+    def _hook_timeout(self, stats: Dict[str, Any]) -> float:
+        """Time budget of an on_query hook, in seconds."""
+        timeout_ms = stats['timeout_ms']
+        if timeout_ms is None:
+            timeout_ms = self.query_timeout_ms
+        return timeout_ms / 1000.0
+    
+    def _run_query_hook(self, callback: Callable, stats: Dict[str, Any], query: str) -> Any:
+        """Run one on_query hook on a worker thread and record its latency."""
+        start = time.perf_counter()
+        try:
+            return callback(query)
+        except Exception as e:
+            print(f"Error in hook on_query: {e}")
+            with self._stats_lock:
+                stats['errors'] += 1
+            return None
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                stats['calls'] += 1
+                stats['total_ms'] += elapsed_ms
+                stats['last_ms'] = elapsed_ms
+                stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+    
+    def _record_timeout(self, stats: Dict[str, Any], future: Any):
+        """Count a call's missed deadline and disable hooks that keep missing it."""
+        with self._stats_lock:
+            if stats['timed_out'] is future:
+                return
+            stats['timed_out'] = future
+            stats['timeouts'] += 1
+            stats['consecutive_timeouts'] += 1
+            if stats['consecutive_timeouts'] >= self.max_consecutive_timeouts and not stats['disabled']:
+                stats['disabled'] = True
+                print(f"Disabling slow on_query hook {stats['hook']} "
+                      f"(plugin {stats['plugin']}) after {stats['consecutive_timeouts']} timeouts")
+    
+    def submit_query_hooks(self, query: str) -> List[Tuple[Callable, Any, float]]:
+        """
+        Start the enabled on_query hooks matching the query on the worker pool.
+        Returns (callback, future, deadline) entries for collect_query_hooks.
+        """
+        if self._query_pool is None:
+            self._query_pool = ThreadPoolExecutor(
+                max_workers=self.query_workers,
+                thread_name_prefix='spotlightx-plugin'
+            )
+        
+        now = time.monotonic()
+        batch = []
+        for callback in self.query_hooks_for(query):
+            stats = self.hook_stats.get(callback)
+            if stats is None:
+                stats = self._track_query_hook(callback)
+            if stats['disabled']:
+                continue
+            
+            # Do not queue another call behind one still running from an
+            # earlier query; that call's overrun counts once, however many
+            # queries it makes skip the hook
+            running = stats['running']
+            if running is not None and not running.done():
+                if stats['deadline'] <= now:
+                    self._record_timeout(stats, running)
+                continue
+            
+            # Counted before the call can start, so stats are never dropped
+            # while it is in flight
+            with self._stats_lock:
+                stats['submitted'] += 1
+            future = self._query_pool.submit(self._run_query_hook, callback, stats, query)
+            stats['running'] = future
+            stats['deadline'] = now + self._hook_timeout(stats)
+            batch.append((callback, future, stats['deadline']))
+        
+        return batch
+    
+    def collect_query_hooks(self, batch: List[Tuple[Callable, Any, float]],
+                            on_late: Optional[Callable] = None) -> List[Any]:
+        """
+        Wait for submitted on_query hooks until their deadlines.
+        Results of hooks that miss their deadline are dropped, or passed to
+        on_late from the worker thread once they arrive.
+        """
+        pending = {future: (callback, deadline) for callback, future, deadline in batch}
+        finished = {}
+        
+        def deliver_late(future):
+            result = future.result()
+            if result is not None:
+                on_late(result)
+        
+        while pending:
+            now = time.monotonic()
+            for future, (callback, deadline) in list(pending.items()):
+                if future.done():
+                    finished[future] = pending.pop(future)
+                elif deadline <= now:
+                    del pending[future]
+                    self._record_timeout(self.hook_stats[callback], future)
+                    if on_late is not None:
+                        future.add_done_callback(deliver_late)
+            
+            if pending:
+                next_deadline = min(deadline for _, deadline in pending.values())
+                wait(pending, timeout=max(next_deadline - time.monotonic(), 0),
+                     return_when=FIRST_COMPLETED)
+        
+        results = []
+        for callback, future, _ in batch:
+            if future not in finished:
+                continue
+            with self._stats_lock:
+                self.hook_stats[callback]['consecutive_timeouts'] = 0
+            result = future.result()
+            if result is not None:
+                results.append(result)
+        
+        return results
+    
+    def get_hook_stats(self) -> List[Dict[str, Any]]:
+        """Latency and timeout counters of every on_query hook."""
+        stats = []
+        with self._stats_lock:
+            for entry in self.hook_stats.values():
+                calls = entry['calls']
+                stats.append({
+                    'plugin': entry['plugin'],
+                    'hook': entry['hook'],
+                    'timeout_ms': entry['timeout_ms'] if entry['timeout_ms'] is not None else self.query_timeout_ms,
+                    'calls': calls,
+                    'timeouts': entry['timeouts'],
+                    'errors': entry['errors'],
+                    'avg_ms': entry['total_ms'] / calls if calls else 0.0,
+                    'max_ms': entry['max_ms'],
+                    'last_ms': entry['last_ms'],
+                    'disabled': entry['disabled']
+                })
+        
+        stats.sort(key=lambda x: x['avg_ms'], reverse=True)
+        return stats
+    
+    def shutdown(self):
+        """Stop the on_query worker pool without waiting for stuck hooks."""
+        if self._query_pool is not None:
+            self._query_pool.shutdown(wait=False)
+            self._query_pool = None
     
     def trigger_hook(self, hook_name: str, *args, **kwargs) -> List[Any]:
         """Trigger all callbacks for a hook."""
         results = []
         
+        if hook_name == 'on_query' and not kwargs and len(args) == 1:
+            return self.collect_query_hooks(self.submit_query_hooks(args[0]))
+        
         if hook_name in self.hooks:
-            for callback in self.hooks[hook_name]:
+            for callback in list(self.hooks[hook_name]):
                 try:
                     result = callback(*args, **kwargs)
                     if result is not None:
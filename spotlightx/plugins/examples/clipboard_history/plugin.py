@@ -27,7 +27,6 @@ Clipboard History Plugin for SpotlightX
 Stores recent clipboard entries and allows pasting them.
 """
 
-import pyperclip
 import time
 import json
 from pathlib import Path
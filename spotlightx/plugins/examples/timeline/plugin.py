@@ -37,8 +37,15 @@ class Timeline:
         self.pm = plugin_manager
         config_dir = self.pm.get_plugin_config_dir('timeline')
         self.db_path = config_dir / 'timeline.db'
-        
-        self.setup_database()
+        # The database is created on first use, not when the plugin loads
+        self.db_ready = False
+    
+    def connect(self):
+        """Open the timeline database, creating it on first use."""
+        if not self.db_ready:
+            self.setup_database()
+            self.db_ready = True
+        return sqlite3.connect(str(self.db_path))
     
     def setup_database(self):
         """Setup SQLite database for timeline."""
@@ -60,7 +67,7 @@ class Timeline:
     def record_activity(self, item):
         """Record activity to timeline."""
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -76,7 +83,7 @@ class Timeline:
     def get_recent_activity(self, limit=10):
         """Get recent activity from timeline."""
         try:
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
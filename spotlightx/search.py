@@ -29,24 +29,106 @@ Implements fuzzy matching with rapidfuzz and ranking algorithm.
 
 import re
 import math
-from typing import List, Dict, Any, Optional
+import heapq
+from collections import OrderedDict
+from typing import List, Dict, Any, Callable, Optional, Tuple
 from rapidfuzz import fuzz, process
+from .metrics import span
+from .search_keys import FIELDS, item_keys, normalize
 from .utils import get_file_type, format_file_size
 
 
+def result_key(result: Dict[str, Any]) -> Tuple:
+    """Identity of a result across the updates of one query."""
+    return (result.get('type'), result.get('path') or result.get('action'), result.get('name'))
+
+
+def merge_results(shown: List[Dict[str, Any]], incoming: List[Dict[str, Any]],
+                  pinned: int = 0) -> Tuple[List[Dict[str, Any]], List[Tuple[int, Dict[str, Any]]]]:
+    """
+    Add later results of a query to the ones already shown.
+    Shown results keep their order; new ones are inserted by score, never
+    above the first `pinned` rows. Returns the merged list and the
+    (position, result) insertions in the order they were applied.
+    """
+    merged = list(shown)
+    seen = set(result_key(result) for result in merged)
+    insertions = []
+    
+    for result in sorted(incoming, key=lambda x: x.get('score', 0), reverse=True):
+        key = result_key(result)
+        if key in seen:
+            continue
+        seen.add(key)
+        
+        score = result.get('score', 0)
+        position = len(merged)
+        for i in range(pinned, len(merged)):
+            if merged[i].get('score', 0) < score:
+                position = i
+                break
+        merged.insert(position, result)
+        insertions.append((position, result))
+    
+    return merged, insertions
+
+
+def settle_results(shown: List[Dict[str, Any]], final: List[Dict[str, Any]],
+                   pinned: int = 0) -> List[Dict[str, Any]]:
+    """
+    Replace the shown results of a query with its final ranking.
+    The first `pinned` rows stay; below them, rows from earlier updates that
+    did not make the final results are dropped.
+    """
+    kept = shown[:pinned]
+    seen = set(result_key(result) for result in kept)
+    return kept + [result for result in merge_results([], final)[0] if result_key(result) not in seen]
+
+
 class SearchEngine:
-    def __init__(self, indexer):
+    def __init__(self, indexer, shard_workers: int = 0):
         self.indexer = indexer
         
+        # Very large file indexes can be searched by worker processes
+        self.shards = None
+        if shard_workers > 1:
+            from .shards import ShardedSearcher
+            self.shards = ShardedSearcher(shard_workers)
+        
         self.weights = {
             'exact_match': 30,
             'fuzzy_ratio': 0.6,
             'recent_boost': 0.4,
+            'frecency_half_life_days': 30,
+            # Apps also match on name words, initials, keywords and their
+            # comment, each weighted like fuzzy_ratio on the full name
+            'token_match': 0.55,
+            'acronym_match': 0.55,
+            'keyword_match': 0.4,
+            'comment_match': 0.3,
+            # Field keys are short, so only close matches count
+            'field_min_ratio': 70,
             'type_app': 10,
             'type_file': 5,
             'type_web': 2,
             'type_calc': 50
         }
+        
+        # Minimum score an indexed item needs to be shown
+        self.thresholds = {
+            'app': 30,
+            'file': 20
+        }
+        
+        # Ratio points below the cutoff still kept as candidates for the
+        # next keystroke, so extending the query can narrow from them
+        self.refine_slack = 15
+        self.cache_size = 64
+        
+        # kind -> (query, index state, ratio floor, kept positions) of the last query
+        self._sessions = {}
+        self._results_cache = OrderedDict()
+        self._cache_state = None
     
     def is_calculator_query(self, query: str) -> bool:
         """Check if query is a calculator expression."""
@@ -126,19 +208,25 @@ class SearchEngine:
         """Calculate relevance score for an item."""
         score = 0.0
         
-        item_name = item.get('name', '').lower()
-        query_lower = query.lower()
+        item_name = normalize(item.get('name', ''))
+        query_lower = normalize(query)
         
         if query_lower == item_name:
             score += self.weights['exact_match']
         
-        fuzzy_score = fuzz.ratio(query_lower, item_name)
-        score += fuzzy_score * self.weights['fuzzy_ratio']
+        fuzzy_score = fuzz.ratio(query_lower, item_name) * self.weights['fuzzy_ratio']
+        if item.get('type') == 'app':
+            for field, keys in item_keys(item).items():
+                for key in keys:
+                    ratio = fuzz.ratio(query_lower, key)
+                    if ratio >= self.weights['field_min_ratio']:
+                        fuzzy_score = max(fuzzy_score, ratio * self.weights[f'{field}_match'])
+        score += fuzzy_score
         
-        usage_data = self.indexer.get_usage(item.get('path', item.get('name', '')))
-        usage_count = usage_data.get('count', 0)
-        if usage_count > 0:
-            score += self.weights['recent_boost'] * math.log(usage_count + 1)
+        self.indexer.frecency.half_life_days = self.weights['frecency_half_life_days']
+        frecency = self.indexer.frecency.score(item.get('path', item.get('name', '')))
+        if frecency > 0:
+            score += self.weights['recent_boost'] * math.log(frecency + 1)
         
         item_type = item.get('type', '')
         if item_type == 'app':
@@ -152,10 +240,298 @@ class SearchEngine:
         
         return score
     
-    def search(self, query: str, max_results: int = 12) -> List[Dict[str, Any]]:
+    def _usage_boosts(self, kind: str) -> Tuple[Any, float]:
+        """Frecency boost per corpus position, and the largest one."""
+        frecency = self.indexer.frecency
+        frecency.half_life_days = self.weights['frecency_half_life_days']
+        return frecency.boosts(kind, self.weights['recent_boost'])
+    
+    def _index_state(self) -> Tuple[int, int]:
+        """Version of the index and usage data that rankings depend on."""
+        return (self.indexer.generation, self.indexer.usage_version)
+    
+    def refine_candidates(self, kind: str, query_lower: str, state: tuple,
+                          score_cutoff: float, name_index) -> Optional[List[int]]:
+        """
+        Return the candidates to score when the new query extends the previous
+        one, or None when the full candidate set has to be searched.
+        
+        Names the previous query scored below its ratio floor f are skipped
+        only if the new characters cannot lift them to the cutoff c. Adding
+        k characters lowers the Indel distance by at most k, so with T the
+        previous query and name lengths combined, such a name now scores
+        below (200k + T f) / (T + k), which is at most c whenever
+        T (c - f) >= k (200 - c). T is at least the previous query length.
+        """
+        session = self._sessions.get(kind)
+        if session is None:
+            return None
+        
+        last_query, last_state, floor, kept = session
+        if last_state != state or not query_lower.startswith(last_query):
+            return None
+        
+        added = len(query_lower) - len(last_query)
+        if floor > 0 and len(last_query) * (score_cutoff - floor) < added * (200 - score_cutoff):
+            return None
+        
+        if name_index is None:
+            return kept
+        
+        # The previous candidates are only a subset of the new ones once the
+        # prefix key is complete
+        if len(last_query) < name_index.prefix_length:
+            return None
+        
+        # Names sharing a trigram the previous query lacked were never scored
+        return sorted(set(kept).union(name_index.added_candidates(last_query, query_lower)))
+    
+    def score_corpus(self, kind: str, items: List[Dict[str, Any]], query: str,
+                     threshold: float, limit: Optional[int] = None) -> List[Tuple[float, int]]:
+        """
+        Score a corpus against the query in one batched rapidfuzz call.
+        Only candidates from the indexer's name index are scored, or the
+        candidates kept from the previous query when this one extends it.
+        Returns (score, index) pairs for items scoring above the threshold,
+        or only the best `limit` of them, highest first, when a limit is given.
+        """
+        if not items:
+            self._sessions.pop(kind, None)
+            return []
+        
+        query_lower = normalize(query)
+        state = self._index_state() + (threshold,)
+        name_index = self.indexer.get_name_index(kind)
+        if name_index is not None and name_index.size == len(items):
+            names = name_index.names
+        else:
+            names = [normalize(item.get('name', '')) for item in items]
+            name_index = None
+        
+        boosts, max_boost = self._usage_boosts(kind)
+        
+        fuzzy_weight = self.weights['fuzzy_ratio']
+        type_boost = self.weights.get(f'type_{kind}', 0)
+        exact_boost = self.weights['exact_match']
+        
+        # Lowest fuzzy ratio that could still clear the threshold
+        score_cutoff = (threshold - type_boost - max_boost) / fuzzy_weight
+        
+        matches = None
+        if limit is not None and self.shards is not None and self.shards.available(len(names)):
+            matches = self.sharded_matches(kind, names, query_lower, max(score_cutoff, 0), limit)
+        
+        if matches is None:
+            candidates = self.refine_candidates(kind, query_lower, state, score_cutoff, name_index)
+            if candidates is None and name_index is not None:
+                candidates = name_index.candidates(query_lower)
+            
+            # Only score names sharing a trigram or prefix with the query
+            choices = names
+            if candidates is not None:
+                choices = {idx: names[idx] for idx in candidates}
+            
+            # Typing more characters can raise a name's ratio, so near misses
+            # are kept for the next query too
+            floor = max(score_cutoff - self.refine_slack, 0)
+            matches = process.extract(
+                query_lower,
+                choices,
+                scorer=fuzz.ratio,
+                processor=None,
+                limit=None,
+                score_cutoff=floor
+            )
+            
+            self._sessions[kind] = (query_lower, state, floor, sorted(idx for _, _, idx in matches))
+        
+        field_keys = self.indexer.get_field_keys(kind)
+        if field_keys is not None and field_keys.size == len(items):
+            matches = self.field_matches(field_keys, names, query_lower, matches, score_cutoff)
+
+        if limit is None:
+            scored = []
+            for name, ratio, idx in matches:
+                if ratio < score_cutoff:
+                    continue
+                score = ratio * fuzzy_weight + type_boost + boosts[idx]
+                if name == query_lower:
+                    score += exact_boost
+                if score > threshold:
+                    scored.append((score, idx))
+            return scored
+        
+        return self.top_scores(matches, query_lower, boosts, max_boost, score_cutoff,
+                               fuzzy_weight, type_boost, threshold, limit)
+    
+    def field_matches(self, field_keys, names: List[str], query_lower: str,
+                      matches: List[Tuple[str, float, int]], score_cutoff: float) -> List[Tuple[str, float, int]]:
+        """
+        Add matches on the precomputed field keys to the name matches. A field
+        match counts as the name ratio that would give the same weighted
+        score, and an item keeps its best match.
+        """
+        fuzzy_weight = self.weights['fuzzy_ratio']
+        field_weights = {field: self.weights[f'{field}_match'] for field in FIELDS}
+        
+        best = {idx: ratio for _, ratio, idx in matches}
+        key_cutoff = max(score_cutoff * fuzzy_weight / max(field_weights.values()), self.weights['field_min_ratio'])
+        for _, ratio, pos in process.extract(query_lower, field_keys.keys, scorer=fuzz.ratio,
+                                             processor=None, limit=None, score_cutoff=key_cutoff):
+            idx = field_keys.owners[pos]
+            equivalent = ratio * field_weights[field_keys.fields[pos]] / fuzzy_weight
+            if equivalent > best.get(idx, -1):
+                best[idx] = equivalent
+        
+        return [(names[idx], ratio, idx) for idx, ratio in best.items()]
+    
+    def top_scores(self, matches: List[Tuple[str, float, int]], query_lower: str, boosts,
+                   max_boost: float, score_cutoff: float, fuzzy_weight: float,
+                   type_boost: float, threshold: float, limit: int) -> List[Tuple[float, int]]:
+        """
+        Keep the best `limit` scores in a bounded heap. Matches are visited by
+        descending ratio, so the walk stops once no remaining match can beat
+        the current k-th best.
+        """
+        exact_boost = self.weights['exact_match']
+        
+        # (score, -order): on equal scores the earlier match wins, like a stable sort
+        heap = []
+        for order, (name, ratio, idx) in enumerate(sorted(matches, key=lambda x: x[1], reverse=True)):
+            if ratio < score_cutoff:
+                break
+            if len(heap) == limit:
+                best_possible = ratio * fuzzy_weight + type_boost + max_boost
+                if ratio == 100:
+                    best_possible += exact_boost
+                if best_possible <= heap[0][0]:
+                    break
+            
+            score = ratio * fuzzy_weight + type_boost + boosts[idx]
+            if name == query_lower:
+                score += exact_boost
+            if score <= threshold:
+                continue
+            
+            if len(heap) < limit:
+                heapq.heappush(heap, (score, -order, idx))
+            else:
+                heapq.heappushpop(heap, (score, -order, idx))
+        
+        heap.sort(reverse=True)
+        return [(score, idx) for score, _, idx in heap]
+    
+    def sharded_matches(self, kind: str, names: List[str], query_lower: str,
+                        score_cutoff: float, limit: int) -> Optional[List[Tuple[str, float, int]]]:
+        """
+        Match the query on the shard workers, or return None if they are not
+        ready. Workers rank by fuzzy ratio alone, so items with a usage boost
+        are scored here as well.
+        """
+        self.shards.ensure(names, self.indexer.generation)
+        sharded = self.shards.extract(names, query_lower, score_cutoff, limit)
+        if sharded is None:
+            return None
+        
+        self._sessions.pop(kind, None)
+        
+        matches = [(names[idx], ratio, idx) for ratio, idx in sharded]
+        seen = set(idx for _, idx in sharded)
+        for idx in self.indexer.frecency.boosted(kind):
+            if idx in seen or idx >= len(names):
+                continue
+            ratio = fuzz.ratio(query_lower, names[idx])
+            if ratio >= score_cutoff:
+                matches.append((names[idx], ratio, idx))
+        
+        return matches
+    
+    def close(self):
+        """Stop the shard workers, if any."""
+        if self.shards is not None:
+            self.shards.close()
+    
+    def make_result(self, kind: str, item: Dict[str, Any], score: float) -> Dict[str, Any]:
+        """
+        Build the result dict for an indexed item. The subtitle of file
+        results is left to decorate(), which only runs for shown results.
+        """
+        result = item.copy()
+        result['score'] = score
+        
+        if kind == 'app':
+            result['subtitle'] = item.get('comment', 'Application')
+            result['action'] = item.get('exec', '')
+        else:
+            result['action'] = item.get('path', '')
+        
+        return result
+    
+    def decorate(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the type, size and path subtitle to a file result about to be shown."""
+        if result.get('type') == 'file' and 'subtitle' not in result:
+            filepath = result.get('path', '')
+            file_type = get_file_type(filepath)
+            file_size = format_file_size(result.get('size', 0))
+            
+            result['subtitle'] = f"{file_type} — {file_size} — {filepath}"
+        
+        return result
+    
+    def search_index(self, query: str, max_results: int,
+                     on_partial: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """
+        Rank indexed apps and files, reusing recent results when possible.
+        on_partial gets the app results before the files are ranked.
+        """
+        # Positions are only stable while the indexer applies no deltas
+        with self.indexer.lock:
+            state = self._index_state()
+            if state != self._cache_state:
+                self._results_cache.clear()
+                self._cache_state = state
+            
+            key = (normalize(query), max_results)
+            cached = self._results_cache.get(key)
+            if cached is not None:
+                self._results_cache.move_to_end(key)
+                return [result.copy() for result in cached]
+            
+            corpora = {
+                'app': self.indexer.get_apps(),
+                'file': self.indexer.get_files()
+            }
+            
+            scored = []
+            for kind, items in corpora.items():
+                if kind == 'file' and on_partial is not None and items:
+                    # Apps are ranked by now; show them while files are scored
+                    top = heapq.nlargest(max_results, scored, key=lambda x: x[0])
+                    on_partial([self.make_result('app', corpora['app'][idx], score) for score, _, idx in top])
+                
+                with span(f'search.{kind}s'):
+                    for score, idx in self.score_corpus(kind, items, query, self.thresholds[kind], max_results):
+                        scored.append((score, kind, idx))
+            
+            with span('search.rank'):
+                # At most max_results per corpus, in score order
+                top = heapq.nlargest(max_results, scored, key=lambda x: x[0])
+                
+                results = [self.make_result(kind, corpora[kind][idx], score)
+                           for score, kind, idx in top]
+            
+            self._results_cache[key] = results
+            if len(self._results_cache) > self.cache_size:
+                self._results_cache.popitem(last=False)
+            
+            return [result.copy() for result in results]
+    
+    def search(self, query: str, max_results: int = 12,
+               on_partial: Optional[Callable] = None) -> List[Dict[str, Any]]:
         """
         Search for items matching the query.
-        Returns sorted list of results.
+        Returns sorted list of results. If on_partial is given, it is called
+        with the URL, shortcut and app results while files are still ranked.
         """
         if not query or not query.strip():
             return []
@@ -163,42 +539,35 @@ class SearchEngine:
         query = query.strip()
         results = []
         
-        calc_result = self.evaluate_calculator(query)
+        with span('search.calc'):
+            calc_result = self.evaluate_calculator(query)
         if calc_result:
             return [calc_result]
         
-        if self.is_url_query(query):
-            results.append(self.create_url_result(query))
-        
-        web_shortcut = self.parse_web_shortcut(query)
-        if web_shortcut:
-            results.append(web_shortcut)
-        
-        apps = self.indexer.get_apps()
-        for app in apps:
-            app_copy = app.copy()
-            app_copy['score'] = self.calculate_score(app, query)
-            app_copy['subtitle'] = app.get('comment', 'Application')
-            app_copy['action'] = app.get('exec', '')
+        with span('search.url'):
+            if self.is_url_query(query):
+                results.append(self.create_url_result(query))
             
-            if app_copy['score'] > 30:
-                results.append(app_copy)
+            web_shortcut = self.parse_web_shortcut(query)
+            if web_shortcut:
+                results.append(web_shortcut)
         
-        files = self.indexer.get_files()
-        for file_item in files:
-            file_copy = file_item.copy()
-            file_copy['score'] = self.calculate_score(file_item, query)
+        partial = None
+        if on_partial is not None:
+            quick = list(results)
             
-            filepath = file_item.get('path', '')
-            file_type = get_file_type(filepath)
-            file_size = format_file_size(file_item.get('size', 0))
-            
-            file_copy['subtitle'] = f"{file_type} — {file_size} — {filepath}"
-            file_copy['action'] = filepath
-            
-            if file_copy['score'] > 20:
-                results.append(file_copy)
+            def partial(app_results):
+                # Nothing to show yet is not worth replacing the previous results
+                if quick or app_results:
+                    on_partial(self.rank(quick + app_results, max_results))
         
+        with span('search.index'):
+            results.extend(self.search_index(query, max_results, partial))
+        
+        return self.rank(results, max_results)
+    
+    def rank(self, results: List[Dict[str, Any]], max_results: int) -> List[Dict[str, Any]]:
+        """The best max_results results, sorted and ready to show."""
         results.sort(key=lambda x: x.get('score', 0), reverse=True)
         
-        return results[:max_results]
+        return [self.decorate(result) for result in results[:max_results]]
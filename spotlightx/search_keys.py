@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Search keys module for SpotlightX.
+Normalized names and the per-field match keys precomputed at index time.
+"""
+
+import re
+import unicodedata
+from array import array
+from typing import Dict, Any, Iterable, List
+
+_WORD_SPLIT = re.compile(r'[\W_]+')
+# camelCase boundaries: LibreOffice, HTTPServer
+_CAMEL_SPLIT = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+# Fields an app can be matched on besides its full name
+FIELD_TOKEN = 'token'
+FIELD_ACRONYM = 'acronym'
+FIELD_KEYWORD = 'keyword'
+FIELD_COMMENT = 'comment'
+FIELDS = (FIELD_TOKEN, FIELD_ACRONYM, FIELD_KEYWORD, FIELD_COMMENT)
+
+# Comment words shorter than this are too common to match on
+MIN_COMMENT_WORD = 4
+
+
+def normalize(text: str) -> str:
+    """Case-fold and strip accents, so 'Éditeur' and 'editeur' compare equal."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def split_words(text: str) -> List[str]:
+    """Split text into words at separators and camelCase boundaries, before normalizing."""
+    words = []
+    for word in _WORD_SPLIT.split(text):
+        if word:
+            words.extend(part for part in _CAMEL_SPLIT.split(word) if part)
+    return words
+
+
+def acronyms(name: str) -> List[str]:
+    """
+    Initials of a name, both per word and per camelCase part:
+    'Visual Studio Code' -> vsc, 'LibreOffice Writer' -> lw and low.
+    """
+    words = [word for word in _WORD_SPLIT.split(name) if word]
+    forms = [''.join(word[0] for word in words)]
+    forms.append(''.join(part[0] for part in split_words(name)))
+    return [normalize(form) for form in dict.fromkeys(forms) if len(form) > 1]
+
+
+def item_keys(item: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Normalized match keys of an app per field, without duplicates."""
+    name = item.get('name', '')
+    normalized_name = normalize(name)
+    
+    tokens = [normalize(word) for word in _WORD_SPLIT.split(name) if word]
+    tokens += [normalize(part) for part in split_words(name)]
+    
+    keywords = [normalize(keyword) for keyword in item.get('keywords') or () if keyword]
+    keywords += [normalize(category) for category in item.get('categories') or () if category]
+    
+    comment = [normalize(word) for word in _WORD_SPLIT.split(item.get('comment', '') or '')
+               if len(word) >= MIN_COMMENT_WORD]
+    
+    keys = {
+        # A single-word name is already matched as the full name
+        FIELD_TOKEN: [token for token in dict.fromkeys(tokens) if len(token) > 1 and token != normalized_name],
+        FIELD_ACRONYM: acronyms(name),
+        FIELD_KEYWORD: list(dict.fromkeys(keywords)),
+        FIELD_COMMENT: list(dict.fromkeys(comment))
+    }
+    return keys
+
+
+class FieldKeys:
+    """
+    Match keys of a corpus flattened into one list for batched matching.
+    keys[i] belongs to item owners[i] and was taken from field fields[i].
+    """
+    
+    def __init__(self):
+        # Number of items the keys were built for
+        self.size = 0
+        self.keys: List[str] = []
+        self.owners = array('I')
+        self.fields: List[str] = []
+    
+    @classmethod
+    def build(cls, items: Iterable[Dict[str, Any]]) -> 'FieldKeys':
+        field_keys = cls()
+        for idx, item in enumerate(items):
+            for field, keys in item_keys(item).items():
+                for key in keys:
+                    field_keys.keys.append(key)
+                    field_keys.owners.append(idx)
+                    field_keys.fields.append(field)
+            field_keys.size += 1
+        return field_keys
+    
+    def __len__(self) -> int:
+        return len(self.keys)
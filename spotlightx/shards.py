@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Sharded search module for SpotlightX.
+Fans fuzzy name matching out to worker processes for very large indexes.
+"""
+
+import os
+import heapq
+import time
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+from rapidfuzz import fuzz, process
+
+from .name_index import NameIndex
+
+
+def shard_worker(conn):
+    """Serve fuzzy queries over one shard of the search names."""
+    names = []
+    index = NameIndex()
+    first = 0
+    
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        
+        op = message[0]
+        if op == 'load':
+            _, shm_name, start, end, first, count = message
+            # Spawned workers share the parent's resource tracker, which
+            # unlinks the block only when the parent releases it
+            shm = shared_memory.SharedMemory(name=shm_name)
+            try:
+                names = bytes(shm.buf[start:end]).decode('utf-8').split('\0') if count else []
+            finally:
+                shm.close()
+            index = NameIndex.build(names)
+            conn.send(len(names))
+        elif op == 'query':
+            _, query, score_cutoff, limit = message
+            choices = {idx: names[idx] for idx in index.candidates(query)}
+            matches = process.extract(
+                query,
+                choices,
+                scorer=fuzz.ratio,
+                processor=None,
+                limit=limit,
+                score_cutoff=score_cutoff
+            )
+            conn.send([(ratio, first + idx, name) for name, ratio, idx in matches])
+        elif op == 'stop':
+            break
+    
+    conn.close()
+
+
+class ShardedSearcher:
+    """
+    Splits the search names into contiguous shards, one per worker process.
+    
+    Names are published through a shared memory block; each worker decodes
+    its slice once and builds its own name index. A query goes to every
+    worker, which returns its best matches by fuzzy ratio, and the shard
+    lists are merged into a global top-k.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, min_size: int = 200000,
+                 republish_interval: float = 10.0):
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.min_size = min_size
+        # The index changes with every file event; shards are refreshed at
+        # most this often and their stale results are checked by name
+        self.republish_interval = republish_interval
+        
+        self.generation = None
+        self._procs = []
+        self._conns = []
+        self._shm = None
+        self._published_at = 0.0
+        self._publishing = False
+        self._lock = threading.Lock()
+    
+    def available(self, size: int) -> bool:
+        """Whether an index of this size should be searched in shards."""
+        return self.workers > 1 and size >= self.min_size
+    
+    def _start(self):
+        context = multiprocessing.get_context('spawn')
+        for _ in range(self.workers):
+            parent_conn, child_conn = context.Pipe()
+            proc = context.Process(target=shard_worker, args=(child_conn,), daemon=True)
+            proc.start()
+            child_conn.close()
+            self._procs.append(proc)
+            self._conns.append(parent_conn)
+    
+    def ensure(self, names: List[str], generation: int):
+        """
+        Republish the names in the background if the index changed.
+        Must be called with the indexer lock held, names are encoded here.
+        """
+        if generation == self.generation or self._publishing:
+            return
+        if self.generation is not None and time.monotonic() - self._published_at < self.republish_interval:
+            return
+        
+        count = len(names)
+        per_shard = -(-count // self.workers)
+        chunks = []
+        layout = []
+        offset = 0
+        for shard in range(self.workers):
+            first = min(shard * per_shard, count)
+            last = min(first + per_shard, count)
+            chunk = '\0'.join(names[first:last]).encode('utf-8')
+            chunks.append(chunk)
+            layout.append((offset, offset + len(chunk), first, last - first))
+            offset += len(chunk)
+        
+        self._publishing = True
+        threading.Thread(
+            target=self._publish,
+            args=(b''.join(chunks), layout, generation),
+            daemon=True
+        ).start()
+    
+    def _publish(self, data: bytes, layout: List[Tuple[int, int, int, int]], generation: int):
+        try:
+            with self._lock:
+                if not self._procs:
+                    self._start()
+                
+                shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+                shm.buf[:len(data)] = data
+                
+                for conn, (start, end, first, count) in zip(self._conns, layout):
+                    conn.send(('load', shm.name, start, end, first, count))
+                for conn in self._conns:
+                    conn.recv()
+                
+                self._release_shm()
+                self._shm = shm
+                self.generation = generation
+                self._published_at = time.monotonic()
+        except Exception as e:
+            print(f"Error publishing search shards: {e}")
+        finally:
+            self._publishing = False
+    
+    def extract(self, names: List[str], query: str, score_cutoff: float,
+                limit: int) -> Optional[List[Tuple[float, int]]]:
+        """
+        Best (ratio, position) matches over all shards, highest first.
+        Returns None if no shards are ready, so the caller searches in-process.
+        """
+        if self.generation is None or not self._lock.acquire(blocking=False):
+            return None
+        
+        try:
+            for conn in self._conns:
+                conn.send(('query', query, score_cutoff, limit))
+            shard_results = [conn.recv() for conn in self._conns]
+        except Exception as e:
+            print(f"Error querying search shards: {e}")
+            return None
+        finally:
+            self._lock.release()
+        
+        # Shards may lag behind the index; drop positions that moved
+        size = len(names)
+        merged = heapq.merge(*shard_results, key=lambda x: x[0], reverse=True)
+        matches = []
+        for ratio, idx, name in merged:
+            if idx < size and names[idx] == name:
+                matches.append((ratio, idx))
+                if len(matches) >= limit:
+                    break
+        
+        return matches
+    
+    def _release_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+    
+    def close(self):
+        """Stop the worker processes and free the shared memory."""
+        with self._lock:
+            for conn in self._conns:
+                try:
+                    conn.send(('stop',))
+                    conn.close()
+                except Exception:
+                    pass
+            for proc in self._procs:
+                proc.join(timeout=1)
+            self._procs = []
+            self._conns = []
+            self._release_shm()
+            self.generation = None
@@ -24,6 +24,7 @@
 
 """UI module for SpotlightX."""
 
+from .query_scheduler import QueryScheduler
 from .tkinter_ui import TkinterUI
 
-__all__ = ['TkinterUI']
+__all__ = ['QueryScheduler', 'TkinterUI']
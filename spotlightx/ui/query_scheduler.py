@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Query scheduler
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Runs search queries off the Tk main loop so typing never waits on search.
+
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class QueryScheduler:
+    """
+    Debounces queries and runs them on a worker thread.
+
+    Keystrokes inside the debounce window collapse into one query. Each new
+    query supersedes the previous one: a superseded query that has not started
+    is skipped, and the results of one that is already running are dropped.
+    Results are handed back on the Tk main loop via after().
+
+    run_query(query, update) may call update(results) any number of times,
+    from any thread, before and up to late_ms after it returns; its return
+    value is the last update. on_results(query, results, replace, final) gets
+    the first update of a query with replace=True and the rest with False;
+    the return value comes with final=True and supersedes earlier updates.
+    Updates arriving within one poll are delivered together.
+    """
+
+    def __init__(self, root, run_query: Callable[[str, Callable], Any],
+                 on_results: Callable[[str, Any, bool, bool], None],
+                 debounce_ms: int = 60, poll_ms: int = 15, late_ms: int = 1000):
+        self.root = root
+        self.run_query = run_query
+        self.on_results = on_results
+        self.debounce_ms = debounce_ms
+        self.poll_ms = poll_ms
+        self.late_ms = late_ms
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='spotlightx-query')
+        self._results = queue.Queue()
+        self._generation = 0
+        self._debounce_id = None
+        self._poll_id = None
+        self._futures = set()
+        self._delivered = -1
+        self._late_until = 0.0
+
+    @property
+    def busy(self) -> bool:
+        """True while the current query is waiting, running or undelivered."""
+        if self._debounce_id is not None or not self._results.empty():
+            return True
+        return any(generation == self._generation for _, generation in self._futures)
+
+    @property
+    def delivered(self) -> bool:
+        """True once some results of the current query have been handed over."""
+        return self._delivered == self._generation
+
+    # --------------------------
+    # Main thread API
+    # --------------------------
+
+    def submit(self, query: str):
+        """Schedule a query, superseding any earlier one."""
+        self.cancel()
+        generation = self._generation
+        self._debounce_id = self.root.after(self.debounce_ms, self._dispatch, query, generation)
+
+    def cancel(self):
+        """Drop the pending query and any results still on their way."""
+        self._generation += 1
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        for future, _ in list(self._futures):
+            future.cancel()
+
+    def shutdown(self):
+        """Stop the worker thread."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # --------------------------
+    # Internals
+    # --------------------------
+
+    def _dispatch(self, query: str, generation: int):
+        self._debounce_id = None
+        if generation != self._generation:
+            return
+
+        future = self._executor.submit(self._run, query, generation)
+        self._futures.add((future, generation))
+        self._schedule_poll()
+
+    def _run(self, query: str, generation: int):
+        # Worker thread: skip queries superseded while they were queued
+        if generation != self._generation:
+            return
+
+        def update(results, final=False):
+            self._results.put((generation, query, results, final))
+
+        try:
+            results = self.run_query(query, update)
+        except Exception as e:
+            print(f"Error running query: {e}")
+            results = []
+
+        update(results, final=True)
+
+    def _deliver(self, updates, final: bool):
+        replace = not self.delivered
+        self._delivered = self._generation
+        self.on_results(updates[-1][0], [result for _, results, _ in updates for result in results], replace, final)
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+
+        updates = []
+        while True:
+            try:
+                generation, query, results, final = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            if final:
+                # The final results already hold every earlier update
+                updates = []
+            updates.append((query, results, final))
+
+        if updates and updates[0][2]:
+            self._deliver([updates.pop(0)], final=True)
+        if updates:
+            self._deliver(updates, final=False)
+
+        self._futures = {(future, generation) for future, generation in self._futures if not future.done()}
+        if self._futures or not self._results.empty():
+            self._late_until = time.monotonic() + self.late_ms / 1000.0
+            self._schedule_poll()
+        elif time.monotonic() < self._late_until:
+            # Plugins that missed their deadline may still send results
+            self._schedule_poll()
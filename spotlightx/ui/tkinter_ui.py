@@ -12,9 +12,13 @@ from typing import List, Dict, Any, Callable
 import threading
 import time
 
+from ..metrics import span
+from ..search import merge_results, result_key, settle_results
+from .query_scheduler import QueryScheduler
+
 
 class TkinterUI:
-    def __init__(self, on_query_callback: Callable, on_select_callback: Callable):
+    def __init__(self, on_query_callback: Callable, on_select_callback: Callable, debounce_ms: int = 60):
         self.on_query = on_query_callback
         self.on_select = on_select_callback
 
@@ -40,6 +44,11 @@ class TkinterUI:
         self.results = []
         self.selected_index = 0
         self.visible = False
+        self._select_when_ready = False
+        self._navigated = False
+
+        # 🧵 Queries run on a worker thread, results stream back via after()
+        self.scheduler = QueryScheduler(self.root, self.on_query, self._on_results, debounce_ms)
 
         # 🧱 Build UI components
         self._build_interface()
@@ -118,26 +127,80 @@ class TkinterUI:
             return
         query = self.entry.get().strip()
         if query and query != "Search apps, files, web...":
-            results = self.on_query(query)
-            self._show_results(results)
+            self.scheduler.submit(query)
         else:
+            self.scheduler.cancel()
             self._clear_results()
 
-    def _show_results(self, results: List[Dict[str, Any]]):
-        self.results = results
-        self.listbox.delete(0, tk.END)
-
-        for res in results:
-            name = res.get('name', 'Unknown')
-            subtitle = res.get('subtitle', '')
-            text = f"{name}"
-            if subtitle:
-                text += f" — {subtitle[:60]}"
-            self.listbox.insert(tk.END, text)
+    def _on_results(self, query: str, results: List[Dict[str, Any]], replace: bool = True,
+                    final: bool = False):
+        if replace:
+            self._show_results(merge_results([], results)[0])
+        elif final:
+            self._settle_results(results)
+        else:
+            self._merge_results(results)
+        if self._select_when_ready:
+            self._select_when_ready = False
+            self._on_enter()
+
+    def _row_text(self, res: Dict[str, Any]) -> str:
+        name = res.get('name', 'Unknown')
+        subtitle = res.get('subtitle', '')
+        text = f"{name}"
+        if subtitle:
+            text += f" — {subtitle[:60]}"
+        return text
 
-        if results:
-            self.listbox.select_set(0)
-            self.selected_index = 0
+    def _show_results(self, results: List[Dict[str, Any]]):
+        with span('ui.render'):
+            self.results = results
+            self._navigated = False
+            self.listbox.delete(0, tk.END)
+
+            for res in results:
+                self.listbox.insert(tk.END, self._row_text(res))
+
+            if results:
+                self.listbox.select_set(0)
+                self.selected_index = 0
+
+    def _merge_results(self, results: List[Dict[str, Any]]):
+        # Later results of the same query are inserted in place. Rows down to
+        # the one the user moved to stay put, so the selection never jumps.
+        with span('ui.render'):
+            pinned = self.selected_index + 1 if self._navigated else 0
+            self.results, insertions = merge_results(self.results, results, pinned)
+
+            for position, res in insertions:
+                self.listbox.insert(position, self._row_text(res))
+
+            if insertions and not self._navigated:
+                self.listbox.select_clear(0, tk.END)
+                self.listbox.select_set(0)
+                self.selected_index = 0
+
+    def _settle_results(self, results: List[Dict[str, Any]]):
+        # The final ranking replaces the rows below the one the user moved
+        # to; only rows that differ are redrawn
+        with span('ui.render'):
+            pinned = self.selected_index + 1 if self._navigated else 0
+            settled = settle_results(self.results, results, pinned)
+
+            first = pinned
+            while (first < min(len(settled), len(self.results))
+                   and result_key(settled[first]) == result_key(self.results[first])):
+                first += 1
+            self.results = settled
+
+            self.listbox.delete(first, tk.END)
+            for res in settled[first:]:
+                self.listbox.insert(tk.END, self._row_text(res))
+
+            if not self._navigated and settled:
+                self.listbox.select_clear(0, tk.END)
+                self.listbox.select_set(0)
+                self.selected_index = 0
 
     def _clear_results(self):
         self.results = []
@@ -147,12 +210,17 @@ class TkinterUI:
     def _navigate(self, direction: int):
         if not self.results:
             return
+        self._navigated = True
         self.listbox.select_clear(self.selected_index)
         self.selected_index = (self.selected_index + direction) % len(self.results)
         self.listbox.select_set(self.selected_index)
         self.listbox.see(self.selected_index)
 
     def _on_enter(self):
+        # Enter before the latest query has shown anything selects its top result
+        if self.scheduler.busy and not self.scheduler.delivered:
+            self._select_when_ready = True
+            return
         if self.results and 0 <= self.selected_index < len(self.results):
             selected = self.results[self.selected_index]
             self.on_select(selected)
@@ -176,6 +244,8 @@ class TkinterUI:
         if self.visible:
             self._fade_out()
             self.visible = False
+            self.scheduler.cancel()
+            self._select_when_ready = False
             self._clear_results()
 
     def toggle(self):
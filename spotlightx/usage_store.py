@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+Usage store module for SpotlightX.
+Write-behind usage statistics: an append-only log plus a compacted snapshot.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+
+class UsageStore:
+    """
+    Usage counts kept in memory and persisted in the background.
+    
+    Each recorded use is appended to a log as the item's new absolute state,
+    so replaying the log over a snapshot is idempotent. The log is folded
+    into the snapshot once it grows past compact_after entries.
+    
+    A read-only store loads the files but never writes them, so it can sit
+    next to a running instance that owns the log.
+    """
+    
+    def __init__(self, snapshot_file: Path, log_file: Path,
+                 flush_interval: float = 2.0, compact_after: int = 1000,
+                 read_only: bool = False):
+        self.snapshot_file = Path(snapshot_file)
+        self.log_file = Path(log_file)
+        self.flush_interval = flush_interval
+        self.compact_after = compact_after
+        self.read_only = read_only
+        
+        self.data = {}
+        self.version = 0
+        
+        self._pending = []
+        self._log_entries = 0
+        self._timer = None
+        # _lock guards the in-memory state, _io_lock orders the file writes
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+    
+    def load(self):
+        """Load the snapshot and replay the log written after it."""
+        data = {}
+        
+        try:
+            if self.snapshot_file.exists():
+                with open(self.snapshot_file, 'r') as f:
+                    data = json.load(f)
+        except Exception as e:
+            print(f"Error loading usage cache: {e}")
+            data = {}
+        
+        try:
+            self._log_entries = self._replay_log(data)
+        except Exception as e:
+            print(f"Error replaying usage log: {e}")
+        
+        with self._lock:
+            self.data.clear()
+            self.data.update(data)
+            self.version += 1
+    
+    def _replay_log(self, data: Dict[str, Any]) -> int:
+        """Apply logged entries to data; drop a torn tail left by a crash."""
+        try:
+            with open(self.log_file, 'rb') as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return 0
+        
+        entries = 0
+        offset = 0
+        while offset < len(raw):
+            end = raw.find(b'\n', offset)
+            if end == -1:
+                break
+            try:
+                entry = json.loads(raw[offset:end])
+                item_id = entry.pop('id')
+            except (ValueError, KeyError, TypeError, AttributeError):
+                break
+            data[item_id] = entry
+            entries += 1
+            offset = end + 1
+        
+        # Later appends must not be glued onto a partial line; a read-only
+        # store may be looking at the owner's append in progress
+        if offset < len(raw) and not self.read_only:
+            os.truncate(self.log_file, offset)
+        
+        return entries
+    
+    def get(self, item_id: str) -> Dict[str, Any]:
+        """Get usage statistics for an item."""
+        return self.data.get(item_id, {'count': 0, 'last_used': 0})
+    
+    def record(self, item_id: str, when: Optional[float] = None, frecency: Optional[float] = None):
+        """Count one use of an item; the write happens in the background."""
+        if when is None:
+            when = time.time()
+        
+        with self._lock:
+            usage = self.data.get(item_id)
+            count = usage['count'] + 1 if usage else 1
+            # Replace rather than mutate, readers may hold the old dict
+            entry = {'count': count, 'last_used': when}
+            if frecency is not None:
+                entry['frecency'] = frecency
+            self.data[item_id] = entry
+            self.version += 1
+            
+            self._pending.append(dict(entry, id=item_id))
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def _take_pending(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending
+            self._pending = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            return pending
+    
+    def flush(self):
+        """Append pending uses to the log, compacting it when it is long."""
+        with self._io_lock:
+            pending = self._take_pending()
+            if self.read_only:
+                return
+            self._append(pending)
+            if self._log_entries >= self.compact_after:
+                self._compact()
+    
+    def _append(self, pending: List[Dict[str, Any]]):
+        if not pending:
+            return
+        
+        lines = ''.join(json.dumps(entry) + '\n' for entry in pending)
+        try:
+            with open(self.log_file, 'a') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_entries += len(pending)
+        except Exception as e:
+            print(f"Error saving usage data: {e}")
+    
+    def compact(self):
+        """Fold the log into the snapshot and start an empty log."""
+        with self._io_lock:
+            pending = self._take_pending()
+            if self.read_only:
+                return
+            self._append(pending)
+            self._compact()
+    
+    def _compact(self):
+        # Uses recorded from here on stay pending and go to the new log
+        with self._lock:
+            snapshot = dict(self.data)
+        
+        tmp_file = self.snapshot_file.with_name(self.snapshot_file.name + '.tmp')
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.snapshot_file)
+            
+            # Replaying entries already in the snapshot is harmless, so a
+            # crash before this point loses nothing
+            with open(self.log_file, 'w'):
+                pass
+            self._log_entries = 0
+        except Exception as e:
+            print(f"Error saving usage cache: {e}")
+    
+    def close(self):
+        """Write everything out; called at shutdown."""
+        self.compact()
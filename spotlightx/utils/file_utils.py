@@ -28,10 +28,32 @@ Enhanced file searching capabilities
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 
+FILE_TYPES = {
+    '.pdf': 'PDF Document',
+    '.doc': 'Word Document',
+    '.docx': 'Word Document',
+    '.txt': 'Text File',
+    '.py': 'Python Script',
+    '.js': 'JavaScript File',
+    '.html': 'HTML File',
+    '.css': 'CSS File',
+    '.jpg': 'JPEG Image',
+    '.jpeg': 'JPEG Image',
+    '.png': 'PNG Image',
+    '.gif': 'GIF Image',
+    '.mp3': 'MP3 Audio',
+    '.mp4': 'MP4 Video',
+    '.zip': 'ZIP Archive',
+    '.tar': 'TAR Archive',
+    '.gz': 'GZIP Archive',
+}
+
+
 def find_files_by_pattern(pattern: str, search_paths: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Find files matching a pattern across search paths.
@@ -89,30 +111,10 @@ def find_files_by_pattern(pattern: str, search_paths: Optional[List[str]] = None
 def get_file_type(filepath: str) -> str:
     """Get human-readable file type."""
     ext = os.path.splitext(filepath)[1].lower()
-    
-    type_map = {
-        '.pdf': 'PDF Document',
-        '.doc': 'Word Document',
-        '.docx': 'Word Document',
-        '.txt': 'Text File',
-        '.py': 'Python Script',
-        '.js': 'JavaScript File',
-        '.html': 'HTML File',
-        '.css': 'CSS File',
-        '.jpg': 'JPEG Image',
-        '.jpeg': 'JPEG Image',
-        '.png': 'PNG Image',
-        '.gif': 'GIF Image',
-        '.mp3': 'MP3 Audio',
-        '.mp4': 'MP4 Video',
-        '.zip': 'ZIP Archive',
-        '.tar': 'TAR Archive',
-        '.gz': 'GZIP Archive',
-    }
-    
-    return type_map.get(ext, 'File')
+    return FILE_TYPES.get(ext, 'File')
 
 
+@lru_cache(maxsize=1024)
 def format_file_size(size_bytes: int) -> str:
     """Format file size to human-readable string."""
     size: float = float(size_bytes)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""
+File watcher module for SpotlightX.
+Applies filesystem events to the file index and application list with watchdog.
+"""
+
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import threading
+from typing import Dict, List, Optional
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+
+class IndexEventHandler(FileSystemEventHandler):
+    """Forwards watchdog events to the indexer as index deltas."""
+
+    def __init__(self, indexer):
+        self.indexer = indexer
+
+    def on_created(self, event):
+        self.indexer.add_path(os.fsdecode(event.src_path), event.is_directory)
+
+    def on_deleted(self, event):
+        self.indexer.remove_path(os.fsdecode(event.src_path), event.is_directory)
+
+    def on_moved(self, event):
+        self.indexer.move_path(
+            os.fsdecode(event.src_path),
+            os.fsdecode(event.dest_path),
+            event.is_directory
+        )
+
+    def on_modified(self, event):
+        path = os.fsdecode(event.src_path)
+        if event.is_directory:
+            self.indexer.touch_dir(path)
+        else:
+            self.indexer.add_path(path)
+
+
+class DirectoryWatch:
+    """
+    Non-recursive inotify watches on exactly the indexed directories, read on
+    one thread. Recursive watchdog watches would also cover hidden and deeper
+    directories, which can exhaust fs.inotify.max_user_watches. Linux only.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_DONT_FOLLOW = 0x02000000
+    IN_EXCL_UNLINK = 0x04000000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK)
+    EVENT = struct.Struct('iIII')
+
+    _libc = None
+
+    def __init__(self, indexer):
+        self.indexer = indexer
+        self.fd = -1
+        self.watches: Dict[str, int] = {}
+        self.paths: Dict[int, str] = {}
+        self._wake_r = self._wake_w = -1
+        self._thread = None
+        self._full = False
+
+    @classmethod
+    def available(cls) -> bool:
+        if not sys.platform.startswith('linux'):
+            return False
+        if cls._libc is None:
+            try:
+                cls._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+                cls._libc.inotify_init1
+            except (OSError, AttributeError):
+                cls._libc = False
+        return bool(cls._libc)
+
+    def start(self):
+        """Watch the indexed directories under every root and start reading events."""
+        self.fd = self._libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._wake_r, self._wake_w = os.pipe()
+
+        for root in self.indexer.file_roots:
+            if os.path.isdir(root):
+                self.watch_tree(os.path.abspath(root))
+
+        self._thread = threading.Thread(target=self._read_loop, name='spotlightx-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            os.write(self._wake_w, b'x')
+            self._thread.join(timeout=2)
+            self._thread = None
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            if fd >= 0:
+                os.close(fd)
+        self.fd = self._wake_r = self._wake_w = -1
+        self.watches.clear()
+        self.paths.clear()
+
+    def watch_tree(self, dirpath: str):
+        """Watch dirpath and the directories below it that are indexed."""
+        for root, dirs, _ in os.walk(dirpath):
+            if not self.indexer.is_indexed_dir(root):
+                dirs[:] = []
+                continue
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            self.watch(root)
+
+    def watch(self, dirpath: str):
+        if dirpath in self.watches or self._full:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error == errno.ENOSPC:
+                self._full = True
+                print(f"Too many directories to watch ({len(self.watches)} watched); "
+                      f"raise fs.inotify.max_user_watches to watch the rest")
+            return
+        self.watches[dirpath] = wd
+        self.paths[wd] = dirpath
+
+    def unwatch_tree(self, dirpath: str):
+        """Stop watching dirpath and everything below it."""
+        prefix = dirpath + os.sep
+        for path in [p for p in self.watches if p == dirpath or p.startswith(prefix)]:
+            wd = self.watches.pop(path)
+            self.paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+        self._full = False
+
+    def _read_loop(self):
+        while True:
+            ready, _, _ = select.select([self.fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                return
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                print(f"Error reading file events: {e}")
+                return
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                try:
+                    self._dispatch(wd, mask, os.fsdecode(name))
+                except Exception as e:
+                    print(f"Error applying file event: {e}")
+
+    def _dispatch(self, wd: int, mask: int, name: str):
+        if mask & self.IN_Q_OVERFLOW:
+            print("File event queue overflowed; some changes are picked up on next start")
+            return
+        if mask & self.IN_IGNORED:
+            path = self.paths.pop(wd, None)
+            if path is not None and self.watches.get(path) == wd:
+                del self.watches[path]
+            return
+
+        dirpath = self.paths.get(wd)
+        if dirpath is None or not name:
+            return
+        path = os.path.join(dirpath, name)
+        is_directory = bool(mask & self.IN_ISDIR)
+
+        # Moves are applied as a removal and an addition, like move_path
+        if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+            if is_directory:
+                self.unwatch_tree(path)
+            self.indexer.remove_path(path, is_directory)
+        elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            # Watch first, so files created while the tree is read are not missed
+            if is_directory:
+                self.watch_tree(path)
+            self.indexer.add_path(path, is_directory)
+        elif mask & self.IN_CLOSE_WRITE:
+            self.indexer.add_path(path)
+
+
+class DesktopEventHandler(FileSystemEventHandler):
+    """Refreshes the application list when .desktop files change."""
+
+    def __init__(self, indexer):
+        self.indexer = indexer
+
+    def on_any_event(self, event):
+        if event.event_type in ('opened', 'closed', 'closed_no_write'):
+            return
+        paths = [event.src_path, getattr(event, 'dest_path', '')]
+        if any(os.fsdecode(path).endswith('.desktop') for path in paths):
+            self.indexer.schedule_apps_refresh()
+
+
+class FileWatcher:
+    """Watches the indexer's file roots and application directories for changes."""
+
+    def __init__(self, indexer):
+        self.indexer = indexer
+        self.observer = None
+        self.directories: Optional[DirectoryWatch] = None
+
+    @property
+    def running(self) -> bool:
+        return self.observer is not None or self.directories is not None
+
+    def watch_roots(self) -> List[str]:
+        """Return the existing file roots, without roots nested inside another."""
+        roots = [os.path.abspath(root) for root in self.indexer.file_roots if os.path.isdir(root)]
+        return [
+            root for root in dict.fromkeys(roots)
+            if not any(root != other and root.startswith(other.rstrip(os.sep) + os.sep) for other in roots)
+        ]
+
+    def start(self) -> bool:
+        """Start watching; returns False if watching is unavailable."""
+        if self.running:
+            return True
+
+        directories = None
+        if DirectoryWatch.available():
+            directories = DirectoryWatch(self.indexer)
+            try:
+                directories.start()
+            except OSError as e:
+                print(f"Error starting file watcher: {e}")
+                directories.stop()
+                directories = None
+
+        if Observer is None:
+            if directories is None:
+                print("watchdog is not installed, file index will refresh on next start")
+                return False
+            self.directories = directories
+            return True
+
+        observer = Observer()
+        observer.daemon = True
+        handler = IndexEventHandler(self.indexer)
+        desktop_handler = DesktopEventHandler(self.indexer)
+
+        try:
+            # Without inotify, fall back to recursive watches; events outside
+            # the index are ignored by the indexer
+            if directories is None:
+                for root in self.watch_roots():
+                    observer.schedule(handler, root, recursive=True)
+            for desktop_path in dict.fromkeys(self.indexer.desktop_paths):
+                if os.path.isdir(desktop_path):
+                    observer.schedule(desktop_handler, desktop_path, recursive=False)
+            observer.start()
+        except Exception as e:
+            print(f"Error starting file watcher: {e}")
+            if directories is not None:
+                directories.stop()
+            return False
+
+        self.observer = observer
+        self.directories = directories
+        return True
+
+    def stop(self):
+        """Stop watching."""
+        if self.directories is not None:
+            self.directories.stop()
+            self.directories = None
+
+        if self.observer is None:
+            return
+
+        self.observer.stop()
+        self.observer.join(timeout=2)
+        self.observer = None
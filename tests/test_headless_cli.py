@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for the query and batch commands of python -m spotlightx."""
+
+import json
+
+import pytest
+
+import spotlightx.headless
+from spotlightx.__main__ import headless_main
+
+
+class FakeHeadless:
+    """Answers every query with its own text, without touching the index."""
+    
+    def __init__(self, **kwargs):
+        self.options = kwargs
+    
+    def query(self, query, limit=12):
+        return [{'type': 'file', 'name': query, 'score': 1}] * limit
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.mark.parametrize('argv', [
+    ['query', '--limit', '3', 'fire', 'fox', '--json'],
+    ['query', 'fire', '--limit', '3', 'fox', '--json'],
+    ['query', '--json', 'fire', 'fox', '--limit', '3'],
+])
+def test_options_around_the_query_text(argv, monkeypatch, capsys):
+    monkeypatch.setattr(spotlightx.headless, 'HeadlessSpotlightX', FakeHeadless)
+    
+    assert headless_main(argv) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert [result['name'] for result in results] == ['fire fox'] * 3
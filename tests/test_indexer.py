@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for walking the file roots into the index."""
+
+import threading
+
+import pytest
+
+from spotlightx.indexer import Indexer
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    # Only the file walk is under test
+    monkeypatch.setattr(Indexer, 'refresh_applications', lambda self: 0)
+    home = tmp_path / 'home'
+    for folder in ('Documents', 'Downloads'):
+        (home / folder).mkdir(parents=True)
+        for i in range(20):
+            (home / folder / f"{folder.lower()}{i}.txt").write_text('x')
+    return home
+
+
+def open_indexer(cache_dir, home, max_files: int) -> Indexer:
+    indexer = Indexer(cache_dir=str(cache_dir))
+    indexer.file_roots = [str(home / 'Documents'), str(home / 'Downloads'), str(home)]
+    indexer.max_files = max_files
+    indexer.load_caches()
+    return indexer
+
+
+def test_raising_the_file_cap_walks_again(tmp_path, home):
+    indexer = open_indexer(tmp_path / 'cache', home, 10)
+    indexer.index_all()
+    assert len(indexer.get_files()) == 10
+    indexer.close()
+    
+    indexer = open_indexer(tmp_path / 'cache', home, 1000)
+    assert indexer.detect_drift()
+    indexer.index_all()
+    assert len(indexer.get_files()) == 40
+    indexer.close()
+    
+    indexer = open_indexer(tmp_path / 'cache', home, 2000)
+    assert not indexer.detect_drift()
+    indexer.close()
+
+
+def test_file_cap_keeps_earlier_roots(tmp_path, home):
+    for i in range(20):
+        (home / f"home{i}.txt").write_text('x')
+    
+    kept = []
+    for _ in range(3):
+        indexer = Indexer(cache_dir=str(tmp_path / 'cache'))
+        indexer.file_roots = [str(home / 'Documents'), str(home / 'Downloads'), str(home)]
+        indexer.walk_workers = 8
+        kept.append(indexer.index_files(max_files=25).names)
+        indexer.close()
+    
+    assert kept[0] == kept[1] == kept[2]
+    assert kept[0] == sorted(f"documents{i}.txt" for i in range(20)) + sorted(f"downloads{i}.txt" for i in range(20))[:5]
+
+
+def test_new_tree_is_walked_outside_the_lock(tmp_path, home, monkeypatch):
+    indexer = open_indexer(tmp_path / 'cache', home, 1000)
+    indexer.index_all()
+    generation = indexer.generation
+    
+    tree = home / 'Documents' / 'project'
+    (tree / 'notes').mkdir(parents=True)
+    (tree / 'plan.txt').write_text('x')
+    (tree / 'notes' / 'monday.txt').write_text('x')
+    
+    # Searches take the lock from other threads while the tree is walked
+    free = []
+    stat_file = Indexer._stat_file
+    
+    def probe_lock(lock):
+        acquired = lock.acquire(timeout=1)
+        if acquired:
+            lock.release()
+        free.append(acquired)
+    
+    def checked_stat_file(self, filepath):
+        probe = threading.Thread(target=probe_lock, args=(self.lock,))
+        probe.start()
+        probe.join()
+        return stat_file(self, filepath)
+    
+    monkeypatch.setattr(Indexer, '_stat_file', checked_stat_file)
+    indexer.add_path(str(tree), is_directory=True)
+    
+    assert free == [True, True]
+    assert {'plan.txt', 'monday.txt'} <= set(indexer.get_files().names)
+    assert indexer.generation == generation + 1
+    indexer.close()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for the instance socket."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from spotlightx import client
+from spotlightx.ipc import IPCServer, send
+
+
+class QueuedRoot:
+    """Stands in for Tk: after() calls wait until the test runs them."""
+    
+    def __init__(self):
+        self.calls = []
+        self.scheduled = threading.Event()
+    
+    def after(self, ms, callback, *args):
+        self.calls.append((callback, args))
+        self.scheduled.set()
+    
+    def run_pending(self):
+        calls, self.calls = self.calls, []
+        for callback, args in calls:
+            callback(*args)
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = IPCServer({'toggle': lambda request: {'visible': True}}, path=str(tmp_path / 'ipc.sock'))
+    assert server.listen()
+    server._root = QueuedRoot()
+    yield server
+    server._root = None
+    server.close()
+
+
+def test_idle_client_does_not_block_accept(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+        idle.connect(server.path)
+        time.sleep(0.05)
+        
+        start = time.monotonic()
+        server.accept()
+        assert time.monotonic() - start < 0.1
+
+
+def test_ui_commands_run_on_the_main_loop(server):
+    replies = []
+    client = threading.Thread(target=lambda: replies.append(send('toggle', server.path)))
+    client.start()
+    time.sleep(0.05)
+    server.accept()
+    
+    assert server._root.scheduled.wait(5)
+    assert replies == []
+    server._root.run_pending()
+    client.join(5)
+    
+    assert replies == [{'ok': True, 'visible': True}]
+
+
+def test_client_accepts_options_before_the_query_text(tmp_path, monkeypatch, capsys):
+    def query(request):
+        return {'results': [{'name': request['query']}] * request['limit']}
+    
+    server = IPCServer({'query': query}, background=('query',), path=str(tmp_path / 'ipc.sock'))
+    assert server.listen()
+    server.serve_in_thread()
+    monkeypatch.setenv('SPOTLIGHTX_SOCKET', server.path)
+    try:
+        assert client.main(['query', '--limit', '3', 'fire', 'fox']) == 0
+    finally:
+        server.close()
+    
+    assert capsys.readouterr().out == 'fire fox\n' * 3
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for deferred plugin loading and on_query hook timeouts in PluginManager."""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from spotlightx.plugin_manager import PluginManager
+
+PLUGIN_SOURCE = '''
+def on_query(query):
+    return [{'type': 'info', 'name': 'echo ' + query, 'score': 10}]
+
+
+def register(manager):
+    manager.register_hook('on_query', on_query)
+'''
+
+
+class InlineExecutor:
+    """Runs submitted calls before submit() returns, like a worker that wins every race."""
+    
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+    
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def manager(tmp_path):
+    plugin_dir = tmp_path / 'plugins' / 'echo'
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / 'plugin.py').write_text(PLUGIN_SOURCE)
+    (plugin_dir / 'plugin.json').write_text(json.dumps({
+        'id': 'echo',
+        'enabled': True,
+        'hooks': ['on_query'],
+        'query_timeout_ms': 5000
+    }))
+    
+    manager = PluginManager(str(tmp_path))
+    manager.load_all_plugins(defer=True)
+    yield manager
+    manager.shutdown()
+
+
+def test_query_while_deferred_plugin_loads(manager):
+    assert manager.plugins['echo']['module'] is None
+    
+    # The stand-in hook imports the plugin before submit_query_hooks has
+    # finished with it
+    manager._query_pool = InlineExecutor()
+    batch = manager.submit_query_hooks('hello')
+    results = manager.collect_query_hooks(batch)
+    
+    assert results == [[{'type': 'info', 'name': 'echo hello', 'score': 10}]]
+    assert manager.plugins['echo']['module'] is not None
+    assert [stats['calls'] for stats in manager.get_hook_stats() if stats['plugin'] == 'echo'] == [1, 0]
+
+
+def test_unused_stand_ins_drop_their_stats(manager):
+    manager.ensure_plugin_loaded('echo')
+    
+    hooks = [stats['hook'] for stats in manager.get_hook_stats()]
+    assert hooks == ['on_query']
+
+
+def test_overrunning_call_counts_one_timeout(tmp_path):
+    manager = PluginManager(str(tmp_path))
+    release = threading.Event()
+    
+    def slow(query):
+        release.wait(5)
+        return None
+    
+    manager.register_hook('on_query', slow, timeout_ms=20)
+    try:
+        manager.collect_query_hooks(manager.submit_query_hooks('a'))
+        # Later keystrokes skip the hook while its first call still runs
+        for query in ('ab', 'abc', 'abcd', 'abcde', 'abcdef'):
+            assert manager.submit_query_hooks(query) == []
+            time.sleep(0.03)
+        
+        stats = manager.get_hook_stats()[0]
+        assert stats['timeouts'] == 1
+        assert not stats['disabled']
+    finally:
+        release.set()
+        manager.shutdown()
+
+
+def test_registering_triggers_while_queries_run(tmp_path):
+    manager = PluginManager(str(tmp_path))
+    errors = []
+    done = threading.Event()
+    
+    def type_queries():
+        while not done.is_set():
+            try:
+                manager.query_hooks_for('x' * 300)
+            except RuntimeError as e:
+                errors.append(e)
+                return
+    
+    typist = threading.Thread(target=type_queries)
+    typist.start()
+    try:
+        # Every hook adds a new prefix length to the trigger table
+        for length in range(1, 2000):
+            manager.register_hook('on_query', lambda query: None, prefixes=['y' * length])
+    finally:
+        done.set()
+        typist.join()
+    
+    assert errors == []
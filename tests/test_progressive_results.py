@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for showing a query's results as they arrive."""
+
+import threading
+
+from spotlightx.search import merge_results, settle_results
+from spotlightx.ui.query_scheduler import QueryScheduler
+
+
+def result(name: str, score: float):
+    return {'type': 'file', 'name': name, 'path': '/home/u/' + name, 'score': score}
+
+
+class ManualRoot:
+    """Collects after() calls so the test can run them in order."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def after(self, ms, callback, *args):
+        self.calls.append((callback, args))
+        return len(self.calls)
+    
+    def after_cancel(self, call_id):
+        pass
+    
+    def run_pending(self):
+        calls, self.calls = self.calls, []
+        for callback, args in calls:
+            callback(*args)
+
+
+def test_final_results_drop_partial_rows():
+    # Apps arrive first, then the index ranks files above most of them
+    apps = [result(f"app{i}", 60 - i) for i in range(40)]
+    files = [result(f"file{i}", 100 - i) for i in range(10)]
+    final = files + apps[:2]
+    
+    shown, _ = merge_results([], apps[:12])
+    shown, _ = merge_results(shown, final)
+    assert len(shown) == 22
+    
+    assert settle_results(shown, final) == merge_results([], final)[0]
+
+
+def test_final_results_keep_pinned_rows():
+    shown = [result('app0', 60), result('app1', 59), result('app2', 58)]
+    final = [result('file0', 100), result('app0', 60)]
+    
+    settled = settle_results(shown, final, pinned=2)
+    assert [res['name'] for res in settled] == ['app0', 'app1', 'file0']
+
+
+def test_scheduler_delivers_the_final_results_last():
+    root = ManualRoot()
+    delivered = []
+    ran = threading.Event()
+    
+    def run_query(query, update):
+        update([result('partial', 10)])
+        ran.set()
+        return [result('final', 20)]
+    
+    scheduler = QueryScheduler(root, run_query, lambda *args: delivered.append(args))
+    try:
+        scheduler.submit('fi')
+        root.run_pending()
+        ran.wait(5)
+        scheduler._executor.submit(lambda: None).result(5)
+        root.run_pending()
+    finally:
+        scheduler.shutdown()
+    
+    assert delivered == [('fi', [result('final', 20)], True, True)]
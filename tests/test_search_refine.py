@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for narrowing search candidates while the query is typed."""
+
+import random
+
+import pytest
+
+from spotlightx.file_table import FileTable
+from spotlightx.indexer import Indexer
+from spotlightx.search import SearchEngine
+
+LETTERS = 'abcdefghilmnoprstu'
+
+
+def make_word(rng: random.Random) -> str:
+    return ''.join(rng.choice(LETTERS) for _ in range(rng.randint(2, 9)))
+
+
+@pytest.fixture
+def indexer(tmp_path):
+    rng = random.Random(5)
+    names = [
+        make_word(rng) + rng.choice(['', '_' + make_word(rng), '-' + make_word(rng) + make_word(rng)])
+        + rng.choice(['.pdf', '.txt', ''])
+        for _ in range(5000)
+    ] + ['premar']
+    records = [{'type': 'file', 'name': name, 'path': f"/home/u/{i}/{name}", 'mtime': 1.0, 'size': 1}
+               for i, name in enumerate(names)]
+    
+    indexer = Indexer(cache_dir=str(tmp_path))
+    with indexer.lock:
+        indexer.apps_data = []
+        indexer.apps_index = indexer.build_name_index([])
+        indexer.files_data = FileTable.from_records(records)
+        indexer.files_index = indexer.build_name_index(indexer.files_data.names)
+        indexer.generation += 1
+    yield indexer
+    indexer.close()
+
+
+def typed(target: str, rng: random.Random):
+    """Prefixes of target as they reach the search, some keystrokes coalesced."""
+    length = 0
+    while length < len(target):
+        length += rng.choice([1, 1, 1, 2, 3])
+        yield target[:length]
+
+
+def ranking(results):
+    return [(result['name'], result['score']) for result in results]
+
+
+def test_refined_results_equal_fresh_search(indexer):
+    rng = random.Random(11)
+    engine = SearchEngine(indexer)
+    refined = []
+    refine_candidates = engine.refine_candidates
+    
+    def counting_refine(*args):
+        candidates = refine_candidates(*args)
+        refined.append(candidates is not None)
+        return candidates
+    
+    engine.refine_candidates = counting_refine
+    
+    targets = ['grapremar'] + [make_word(rng) + make_word(rng) + make_word(rng) for _ in range(60)]
+    for target in targets:
+        for query in typed(target, rng):
+            assert ranking(engine.search(query)) == ranking(SearchEngine(indexer).search(query)), query
+    
+    # The sequence has to exercise refinement for the comparison to mean anything
+    assert any(refined)
+
+
+def test_new_trigram_candidates_are_scored(indexer):
+    engine = SearchEngine(indexer)
+    for query in typed('grapremar', random.Random(0)):
+        results = engine.search(query)
+    
+    assert 'premar' in [result['name'] for result in results]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# SpotlightX - Sophisticated Linux Application Launcher
+# Copyright (c) 2025 WHO-AM-I-404
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Tests for sharing the usage files with a running instance."""
+
+import json
+
+from spotlightx.indexer import Indexer
+from spotlightx.usage_store import UsageStore
+
+
+def test_read_only_indexer_leaves_the_usage_log_alone(tmp_path):
+    owner = UsageStore(tmp_path / 'usage.json', tmp_path / 'usage.log')
+    owner.load()
+    owner.record('app:firefox', when=100.0)
+    owner.flush()
+    # The owner is in the middle of its next append
+    with open(tmp_path / 'usage.log', 'a') as f:
+        f.write('{"count": 2, "last_u')
+    log = (tmp_path / 'usage.log').read_bytes()
+    
+    indexer = Indexer(cache_dir=str(tmp_path), read_only_usage=True)
+    assert indexer.get_usage('app:firefox')['count'] == 1
+    indexer.record_usage('app:firefox')
+    indexer.close()
+    
+    assert (tmp_path / 'usage.log').read_bytes() == log
+    assert not (tmp_path / 'usage.json').exists()
+    
+    owner.close()
+    assert json.loads((tmp_path / 'usage.json').read_text())['app:firefox']['count'] == 1